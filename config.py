@@ -1,130 +1,155 @@
-"""
-Events Paradise Event Management System
-Configuration Settings
-
-This file contains all configuration settings for the application.
-"""
-
-import os
-from datetime import timedelta
-
-class Config:
-    """Base configuration class"""
-    
-    # Basic Flask Configuration
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-change-in-production'
-    
-    # Database Configuration
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///event_management.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
-    # Session Configuration
-    PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
-    
-    # Application Settings
-    APP_NAME = 'Events Paradise'
-    APP_VERSION = '1.0.0'
-    APP_DESCRIPTION = 'Professional Event Management System'
-    
-    # Pagination Settings
-    EVENTS_PER_PAGE = 10
-    GUESTS_PER_PAGE = 20
-    VENDORS_PER_PAGE = 15
-    PAYMENTS_PER_PAGE = 20
-    
-    # File Upload Settings
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    UPLOAD_FOLDER = 'uploads'
-    
-    # Email Configuration (SendGrid or SMTP)
-    MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
-    MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
-    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
-    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
-    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
-    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
-    
-    # Twilio SMS Configuration
-    TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
-    TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
-    TWILIO_PHONE_NUMBER = os.environ.get('TWILIO_PHONE_NUMBER')
-    
-    # Stripe Payment Configuration
-    STRIPE_PUBLISHABLE_KEY = os.environ.get('STRIPE_PUBLISHABLE_KEY') or 'pk_test_51234567890'
-    STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY') or 'sk_test_51234567890'
-    STRIPE_WEBHOOK_SECRET = os.environ.get('STRIPE_WEBHOOK_SECRET')
-    
-    # Google Calendar Configuration
-    GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
-    GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
-    GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
-    
-    # Currency Settings
-    CURRENCY_SYMBOL = '$'
-    CURRENCY_CODE = 'USD'
-    
-    # Date and Time Settings
-    DATE_FORMAT = '%Y-%m-%d'
-    TIME_FORMAT = '%I:%M %p'
-    DATETIME_FORMAT = '%Y-%m-%d %I:%M %p'
-    
-    # Security Settings
-    WTF_CSRF_ENABLED = True
-    WTF_CSRF_TIME_LIMIT = 3600
-    
-    # API Settings
-    API_VERSION = 'v1'
-    API_RATE_LIMIT = '100/hour'
-    
-    # QR Code Settings
-    QR_CODE_OUTPUT_DIR = 'static/qrcodes'
-    QR_CODE_SIZE = 10
-    QR_CODE_BOX_SIZE = 10
-    QR_CODE_BORDER = 4
-    
-    # Notification Settings
-    NOTIFICATION_CHECK_INTERVAL = 300  # seconds
-    REMINDER_SEND_INTERVAL = 3600  # seconds
-    
-    # WebSocket Settings
-    SOCKETIO_ASYNC_MODE = 'threading'
-    
-    # Scheduler Settings
-    SCHEDULER_API_ENABLED = True
-    SCHEDULER_TIMEZONE = 'UTC'
-
-class DevelopmentConfig(Config):
-    """Development configuration"""
-    DEBUG = True
-    
-class ProductionConfig(Config):
-    """Production configuration"""
-    DEBUG = False
-    
-    # Production security settings
-    SESSION_COOKIE_SECURE = True
-    SESSION_COOKIE_HTTPONLY = True
-    SESSION_COOKIE_SAMESITE = 'LAX'
-    
-    # Production database
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///event_management_prod.db'
-
-class TestingConfig(Config):
-    """Testing configuration"""
-    TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    WTF_CSRF_ENABLED = False
-
-# Configuration dictionary
-config = {
-    'development': DevelopmentConfig,
-    'production': ProductionConfig,
-    'testing': TestingConfig,
-    'default': DevelopmentConfig
-}
-
-# Environment-based configuration selection
-def get_config():
-    """Get configuration based on environment"""
-    env = os.environ.get('FLASK_ENV', 'development')
+"""
+Events Paradise Event Management System
+Configuration Settings
+
+This file contains all configuration settings for the application.
+"""
+
+import os
+from datetime import timedelta
+
+class Config:
+    """Base configuration class"""
+    
+    # Basic Flask Configuration
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-change-in-production'
+    
+    # Database Configuration
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///event_management.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Session Configuration
+    PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
+    
+    # Application Settings
+    APP_NAME = 'Events Paradise'
+    APP_VERSION = '1.0.0'
+    APP_DESCRIPTION = 'Professional Event Management System'
+    
+    # Pagination Settings
+    EVENTS_PER_PAGE = 10
+    GUESTS_PER_PAGE = 20
+    VENDORS_PER_PAGE = 15
+    PAYMENTS_PER_PAGE = 20
+    
+    # File Upload Settings
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    UPLOAD_FOLDER = 'uploads'
+    
+    # Email Configuration (SendGrid or SMTP)
+    MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
+    MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
+    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    
+    # Twilio SMS Configuration
+    TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
+    TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
+    TWILIO_PHONE_NUMBER = os.environ.get('TWILIO_PHONE_NUMBER')
+    # Optional Notify service; enables one-call bulk sends of identical
+    # message bodies
+    TWILIO_NOTIFY_SERVICE_SID = os.environ.get('TWILIO_NOTIFY_SERVICE_SID')
+    # Concurrent in-flight sends during bulk SMS jobs
+    SMS_PARALLELISM = 32
+    # Drop per-guest ticket personalization from bulk reminders so the
+    # whole batch can be enqueued with a single Notify call
+    SMS_GENERIC_BULK = os.environ.get('SMS_GENERIC_BULK', 'false').lower() in ['true', 'on', '1']
+    
+    # Stripe Payment Configuration
+    STRIPE_PUBLISHABLE_KEY = os.environ.get('STRIPE_PUBLISHABLE_KEY') or 'pk_test_51234567890'
+    STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY') or 'sk_test_51234567890'
+    STRIPE_WEBHOOK_SECRET = os.environ.get('STRIPE_WEBHOOK_SECRET')
+    
+    # Google Calendar Configuration
+    GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
+    GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
+    GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+    
+    # Currency Settings
+    CURRENCY_SYMBOL = '$'
+    CURRENCY_CODE = 'USD'
+    
+    # Date and Time Settings
+    DATE_FORMAT = '%Y-%m-%d'
+    TIME_FORMAT = '%I:%M %p'
+    DATETIME_FORMAT = '%Y-%m-%d %I:%M %p'
+    
+    # Security Settings
+    WTF_CSRF_ENABLED = True
+    WTF_CSRF_TIME_LIMIT = 3600
+    
+    # API Settings
+    API_VERSION = 'v1'
+    API_RATE_LIMIT = '100/hour'
+    
+    # QR Code Settings
+    QR_CODE_OUTPUT_DIR = 'static/qrcodes'
+    QR_CODE_SIZE = 10
+    QR_CODE_BOX_SIZE = 10
+    QR_CODE_BORDER = 4
+    # Encode with a fixed mask pattern instead of scoring all eight;
+    # generated codes are machine-scanned so the search is wasted work
+    QR_SKIP_MASK_PATTERN = True
+    
+    # Notification Settings
+    NOTIFICATION_CHECK_INTERVAL = 300  # seconds
+    REMINDER_SEND_INTERVAL = 3600  # seconds
+    
+    # Redis Settings (optional; enables multi-worker Socket.IO fan-out and
+    # shared pending-notification storage)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') or os.environ.get('REDIS_URL')
+
+    # WebSocket Settings
+    # 'eventlet' enables real WebSocket transport; 'threading' falls back to
+    # long-polling and caps concurrency at the thread pool size
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE') or 'eventlet'
+    
+    # Scheduler Settings
+    SCHEDULER_API_ENABLED = True
+    SCHEDULER_TIMEZONE = 'UTC'
+    SCHEDULER_MAX_WORKERS = 20
+    # Lock file used to elect a single scheduler process per host
+    SCHEDULER_LOCK_FILE = os.environ.get('SCHEDULER_LOCK_FILE') or 'scheduler.lock'
+    
+    # Background Task Queue Settings
+    TASK_QUEUE_WORKERS = 4
+    TASK_QUEUE_MAXSIZE = 1000
+
+class DevelopmentConfig(Config):
+    """Development configuration"""
+    DEBUG = True
+    
+class ProductionConfig(Config):
+    """Production configuration"""
+    DEBUG = False
+    
+    # Production security settings
+    SESSION_COOKIE_SECURE = True
+    SESSION_COOKIE_HTTPONLY = True
+    SESSION_COOKIE_SAMESITE = 'LAX'
+    
+    # Production database
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///event_management_prod.db'
+
+class TestingConfig(Config):
+    """Testing configuration"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+
+# Configuration dictionary
+config = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+    'default': DevelopmentConfig
+}
+
+# Environment-based configuration selection
+def get_config():
+    """Get configuration based on environment"""
+    env = os.environ.get('FLASK_ENV', 'development')
     return config.get(env, config['default'])
\ No newline at end of file
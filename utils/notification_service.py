@@ -1,404 +1,622 @@
-"""
-Notification Service Module
-
-This module handles all notification-related functionality:
-- Real-time notifications via WebSocket
-- Push notifications
-- In-app notifications
-- Notification preferences
-"""
-
-import os
-import logging
-import json
-from datetime import datetime, timedelta
-from flask import current_app, request
-from flask_login import current_user
-from flask_socketio import SocketIO
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Initialize SocketIO
-socketio = SocketIO()
-
-class NotificationService:
-    """Notification service class for handling all notifications"""
-    
-    def __init__(self, app=None):
-        """Initialize the notification service"""
-        self.app = app
-        self.connected_users = {}
-        self.user_notifications = {}
-        if app:
-            self.init_app(app)
-    
-    def init_app(self, app):
-        """Initialize with Flask app"""
-        self.app = app
-        
-        # Initialize SocketIO
-        socketio.init_app(
-            app,
-            cors_allowed_origins="*",
-            async_mode=app.config.get('SOCKETIO_ASYNC_MODE', 'threading')
-        )
-        
-        # Register socket event handlers
-        self._register_socket_handlers()
-        
-        logger.info("Notification service initialized")
-    
-    def _register_socket_handlers(self):
-        """Register SocketIO event handlers"""
-        
-        @socketio.on('connect')
-        def handle_connect():
-            """Handle client connection"""
-            user_id = None
-            if current_user.is_authenticated:
-                user_id = current_user.id
-                self.connected_users[user_id] = request.sid
-                self.user_notifications[user_id] = self.user_notifications.get(user_id, [])
-                logger.info(f"User {user_id} connected")
-                
-                # Send pending notifications
-                pending_notifications = self.user_notifications.get(user_id, [])
-                for notification in pending_notifications:
-                    socketio.emit('notification', notification, room=request.sid)
-                
-                # Clear pending notifications
-                self.user_notifications[user_id] = []
-            
-            socketio.emit('connection_established', {'user_id': user_id})
-        
-        @socketio.on('disconnect')
-        def handle_disconnect():
-            """Handle client disconnection"""
-            if current_user.is_authenticated:
-                user_id = current_user.id
-                if user_id in self.connected_users:
-                    del self.connected_users[user_id]
-                logger.info(f"User {user_id} disconnected")
-        
-        @socketio.on('mark_notification_read')
-        def handle_mark_read(notification_id):
-            """Handle marking notification as read"""
-            if current_user.is_authenticated:
-                user_id = current_user.id
-                logger.info(f"User {user_id} marked notification {notification_id} as read")
-                socketio.emit('notification_read', {'notification_id': notification_id})
-        
-        @socketio.on('get_user_notifications')
-        def handle_get_notifications():
-            """Handle getting user notifications"""
-            if current_user.is_authenticated:
-                user_id = current_user.id
-                notifications = self.get_user_notifications(user_id)
-                socketio.emit('user_notifications', notifications, room=request.sid)
-    
-    def send_notification(self, user_id, notification_data):
-        """
-        Send notification to a specific user
-        
-        Args:
-            user_id (int): User ID
-            notification_data (dict): Notification data
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
-        try:
-            notification = {
-                'id': f"notif_{datetime.now().timestamp()}",
-                'user_id': user_id,
-                'type': notification_data.get('type', 'info'),
-                'title': notification_data.get('title', ''),
-                'message': notification_data.get('message', ''),
-                'data': notification_data.get('data', {}),
-                'created_at': datetime.now().isoformat(),
-                'read': False
-            }
-            
-            # Check if user is connected
-            if user_id in self.connected_users:
-                # Send real-time notification
-                socketio.emit('notification', notification, room=self.connected_users[user_id])
-                logger.info(f"Real-time notification sent to user {user_id}")
-                return True
-            else:
-                # Store notification for later delivery
-                if user_id not in self.user_notifications:
-                    self.user_notifications[user_id] = []
-                self.user_notifications[user_id].append(notification)
-                logger.info(f"Notification stored for user {user_id} (offline)")
-                return True
-                
-        except Exception as e:
-            logger.error(f"Failed to send notification to user {user_id}: {str(e)}")
-            return False
-    
-    def send_broadcast_notification(self, notification_data, user_role=None):
-        """
-        Send broadcast notification to all users or users with specific role
-        
-        Args:
-            notification_data (dict): Notification data
-            user_role (str): User role filter (optional)
-            
-        Returns:
-            int: Number of users notified
-        """
-        try:
-            notification = {
-                'id': f"broadcast_{datetime.now().timestamp()}",
-                'type': notification_data.get('type', 'info'),
-                'title': notification_data.get('title', ''),
-                'message': notification_data.get('message', ''),
-                'data': notification_data.get('data', {}),
-                'created_at': datetime.now().isoformat(),
-                'broadcast': True
-            }
-            
-            # Send to all connected users (or filtered by role)
-            notified_count = 0
-            for user_id, sid in self.connected_users.items():
-                # In a real implementation, you would check user role here
-                # For now, send to all connected users
-                socketio.emit('notification', notification, room=sid)
-                notified_count += 1
-            
-            logger.info(f"Broadcast notification sent to {notified_count} users")
-            return notified_count
-            
-        except Exception as e:
-            logger.error(f"Failed to send broadcast notification: {str(e)}")
-            return 0
-    
-    def send_event_notification(self, event, notification_type, data=None):
-        """
-        Send event-related notification
-        
-        Args:
-            event: Event object
-            notification_type (str): Type of notification
-            data (dict): Additional data
-            
-        Returns:
-            int: Number of users notified
-        """
-        try:
-            if data is None:
-                data = {}
-            
-            notification_data = {
-                'type': 'event',
-                'subtype': notification_type,
-                'title': f"Event Update: {event.title}",
-                'message': self._get_event_message(event, notification_type),
-                'data': {
-                    'event_id': event.id,
-                    'event_title': event.title,
-                    'event_status': event.status,
-                    **data
-                }
-            }
-            
-            # Send to event organizer
-            if event.organizer_id:
-                self.send_notification(event.organizer_id, notification_data)
-            
-            # Send to all guests (for certain notification types)
-            if notification_type in ['event_reminder', 'event_cancelled', 'event_updated']:
-                notified_guests = 0
-                for guest in event.guests:
-                    # In a real implementation, you would have user accounts for guests
-                    # For now, we'll send to the organizer only
-                    pass
-                return 1  # Organizer notified
-            
-            return 1  # Organizer notified
-            
-        except Exception as e:
-            logger.error(f"Failed to send event notification for {event.title}: {str(e)}")
-            return 0
-    
-    def send_payment_notification(self, payment, user_id, notification_type):
-        """
-        Send payment-related notification
-        
-        Args:
-            payment: Payment object
-            user_id (int): User ID
-            notification_type (str): Type of notification
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
-        try:
-            notification_data = {
-                'type': 'payment',
-                'subtype': notification_type,
-                'title': f"Payment {notification_type.replace('_', ' ').title()}",
-                'message': self._get_payment_message(payment, notification_type),
-                'data': {
-                    'payment_id': payment.id,
-                    'amount': payment.amount,
-                    'payment_type': payment.payment_type,
-                    'transaction_id': payment.transaction_id,
-                    'status': payment.status
-                }
-            }
-            
-            return self.send_notification(user_id, notification_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to send payment notification: {str(e)}")
-            return False
-    
-    def send_guest_notification(self, guest, event, notification_type):
-        """
-        Send guest-related notification
-        
-        Args:
-            guest: Guest object
-            event: Event object
-            notification_type (str): Type of notification
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
-        try:
-            notification_data = {
-                'type': 'guest',
-                'subtype': notification_type,
-                'title': f"Guest {notification_type.replace('_', ' ').title()}",
-                'message': self._get_guest_message(guest, event, notification_type),
-                'data': {
-                    'guest_id': guest.id,
-                    'guest_name': guest.name,
-                    'event_id': event.id,
-                    'event_title': event.title,
-                    'ticket_number': guest.ticket_number
-                }
-            }
-            
-            # Send to event organizer
-            if event.organizer_id:
-                return self.send_notification(event.organizer_id, notification_data)
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Failed to send guest notification: {str(e)}")
-            return False
-    
-    def get_user_notifications(self, user_id, limit=50):
-        """
-        Get notifications for a user
-        
-        Args:
-            user_id (int): User ID
-            limit (int): Maximum number of notifications
-            
-        Returns:
-            list: User notifications
-        """
-        try:
-            # In a real implementation, you would fetch from database
-            # For now, return empty list
-            return []
-            
-        except Exception as e:
-            logger.error(f"Failed to get notifications for user {user_id}: {str(e)}")
-            return []
-    
-    def mark_notification_read(self, user_id, notification_id):
-        """
-        Mark notification as read
-        
-        Args:
-            user_id (int): User ID
-            notification_id (str): Notification ID
-            
-        Returns:
-            bool: True if marked successfully, False otherwise
-        """
-        try:
-            # In a real implementation, you would update in database
-            logger.info(f"Notification {notification_id} marked as read for user {user_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to mark notification {notification_id} as read: {str(e)}")
-            return False
-    
-    def _get_event_message(self, event, notification_type):
-        """Get event notification message"""
-        messages = {
-            'event_created': f"New event '{event.title}' has been created.",
-            'event_updated': f"Event '{event.title}' has been updated.",
-            'event_cancelled': f"Event '{event.title}' has been cancelled.",
-            'event_reminder': f"Reminder: Event '{event.title}' is coming up soon.",
-            'event_started': f"Event '{event.title}' has started.",
-            'event_completed': f"Event '{event.title}' has been completed."
-        }
-        return messages.get(notification_type, f"Update for event '{event.title}'.")
-    
-    def _get_payment_message(self, payment, notification_type):
-        """Get payment notification message"""
-        messages = {
-            'payment_received': f"Payment of ${payment.amount:.2f} has been received.",
-            'payment_failed': f"Payment of ${payment.amount:.2f} has failed.",
-            'payment_refunded': f"Payment of ${payment.amount:.2f} has been refunded.",
-            'payment_pending': f"Payment of ${payment.amount:.2f} is pending."
-        }
-        return messages.get(notification_type, f"Payment update for ${payment.amount:.2f}.")
-    
-    def _get_guest_message(self, guest, event, notification_type):
-        """Get guest notification message"""
-        messages = {
-            'guest_registered': f"{guest.name} has registered for '{event.title}'.",
-            'guest_checked_in': f"{guest.name} has checked in for '{event.title}'.",
-            'guest_rsvp_confirmed': f"{guest.name} has confirmed RSVP for '{event.title}'.",
-            'guest_rsvp_declined': f"{guest.name} has declined RSVP for '{event.title}'."
-        }
-        return messages.get(notification_type, f"Guest update for {guest.name}.")
-    
-    def get_connected_users(self):
-        """
-        Get list of connected users
-        
-        Returns:
-            dict: Connected users
-        """
-        return {
-            'total_connected': len(self.connected_users),
-            'users': list(self.connected_users.keys())
-        }
-    
-    def cleanup_old_notifications(self, days=30):
-        """
-        Clean up old notifications
-        
-        Args:
-            days (int): Number of days to keep notifications
-            
-        Returns:
-            int: Number of notifications cleaned up
-        """
-        try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            cleaned_count = 0
-            
-            # In a real implementation, you would clean up database
-            logger.info(f"Cleaned up {cleaned_count} old notifications")
-            return cleaned_count
-            
-        except Exception as e:
-            logger.error(f"Failed to cleanup old notifications: {str(e)}")
-            return 0
-
-# Global notification service instance
+"""
+Notification Service Module
+
+This module handles all notification-related functionality:
+- Real-time notifications via WebSocket
+- Push notifications
+- In-app notifications
+- Notification preferences
+"""
+
+import os
+import itertools
+import logging
+import json
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from flask import current_app, request
+from flask_login import current_user
+from flask_socketio import SocketIO, join_room
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import orjson
+
+    class _OrjsonShim:
+        """Adapter exposing the str-based dumps/loads Socket.IO expects"""
+
+        @staticmethod
+        def dumps(obj, *args, **kwargs):
+            return orjson.dumps(obj).decode('utf-8')
+
+        @staticmethod
+        def loads(data, *args, **kwargs):
+            return orjson.loads(data)
+
+    _socketio_json = _OrjsonShim
+except ImportError:
+    _socketio_json = json
+
+# Module logger; handlers are configured by the application entrypoint
+logger = logging.getLogger(__name__)
+
+# Initialize SocketIO
+socketio = SocketIO()
+
+# All notification traffic lives on its own namespace; rooms within it
+# (per-user, per-role, broadcast) let the transport layer do recipient
+# filtering instead of Python-level scans
+NOTIFICATIONS_NAMESPACE = '/notifications'
+
+# Batching parameters for coalescing notifications into single frames
+NOTIFICATION_FLUSH_INTERVAL = 0.1  # seconds between outbox flushes
+NOTIFICATION_BATCH_LIMIT = 100  # flush immediately once a user's batch hits this
+NOTIFICATION_DEDUP_TTL = 60  # seconds a sent notification suppresses duplicates
+
+# Bounds for the offline pending-notification store
+MAX_PENDING_PER_USER = 200  # oldest entries are dropped beyond this
+MAX_PENDING_USERS = 1000  # least recently active users are evicted beyond this
+
+# Seconds a Redis presence key survives without a client heartbeat; a
+# crashed client that never fires the disconnect handler ages out on its own
+PRESENCE_TTL = 90
+
+# Message templates, kept as plain strings so only the selected one is
+# formatted per notification
+_EVENT_TEMPLATES = {
+    'event_created': "New event '{title}' has been created.",
+    'event_updated': "Event '{title}' has been updated.",
+    'event_cancelled': "Event '{title}' has been cancelled.",
+    'event_reminder': "Reminder: Event '{title}' is coming up soon.",
+    'event_started': "Event '{title}' has started.",
+    'event_completed': "Event '{title}' has been completed."
+}
+_DEFAULT_EVENT_TEMPLATE = "Update for event '{title}'."
+
+_PAYMENT_TEMPLATES = {
+    'payment_received': "Payment of ${amount:.2f} has been received.",
+    'payment_failed': "Payment of ${amount:.2f} has failed.",
+    'payment_refunded': "Payment of ${amount:.2f} has been refunded.",
+    'payment_pending': "Payment of ${amount:.2f} is pending."
+}
+_DEFAULT_PAYMENT_TEMPLATE = "Payment update for ${amount:.2f}."
+
+_GUEST_TEMPLATES = {
+    'guest_registered': "{name} has registered for '{title}'.",
+    'guest_checked_in': "{name} has checked in for '{title}'.",
+    'guest_rsvp_confirmed': "{name} has confirmed RSVP for '{title}'.",
+    'guest_rsvp_declined': "{name} has declined RSVP for '{title}'."
+}
+_DEFAULT_GUEST_TEMPLATE = "Guest update for {name}."
+
+class NotificationService:
+    """Notification service class for handling all notifications"""
+
+    def __init__(self, app=None):
+        """Initialize the notification service"""
+        self.app = app
+        # Presence is a plain set of user ids; room membership (not SIDs)
+        # drives emits, so membership tests stay O(1) and multiple tabs
+        # per user all land in the same room
+        self.connected_user_ids = set()
+        # user_id -> bounded deque of pending notifications, ordered by
+        # last activity so stale users can be evicted LRU-first
+        self.user_notifications = OrderedDict()
+        self._outbox = {}
+        self._flush_task = None
+        self._redis = None
+        # Clock snapshot refreshed once per flush tick plus a counter, so
+        # stamping IDs/timestamps avoids a clock read per notification
+        self._id_counter = itertools.count()
+        self._refresh_clock()
+        # (user_id, dedup key) -> timestamp of last emit, pruned per flush
+        self._recent_keys = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Initialize with Flask app"""
+        self.app = app
+
+        # Initialize SocketIO; a Redis message queue lets emits from one
+        # worker reach sockets held by another
+        socketio.init_app(
+            app,
+            cors_allowed_origins="*",
+            async_mode=app.config.get('SOCKETIO_ASYNC_MODE', 'eventlet'),
+            message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'),
+            channel='evpara',
+            json=_socketio_json
+        )
+
+        # Optional Redis backend for pending notifications so offline
+        # deliveries survive restarts and are shared across workers
+        redis_url = app.config.get('REDIS_URL') or app.config.get('SOCKETIO_MESSAGE_QUEUE')
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = redis.Redis.from_url(redis_url)
+            else:
+                logger.warning("redis package not installed. Pending notifications will be kept in memory.")
+
+        # Register socket event handlers
+        self._register_socket_handlers()
+
+        # Start the outbox flush loop that coalesces notifications into
+        # batched frames
+        self._flush_task = socketio.start_background_task(self._flush_outbox_loop)
+
+        logger.info("Notification service initialized")
+
+    def _refresh_clock(self):
+        """Snapshot the current time for ID and timestamp stamping"""
+        now = datetime.now()
+        self._now_ts = now.timestamp()
+        self._now_iso = now.isoformat()
+
+    def _flush_outbox_loop(self):
+        """Periodically flush batched notifications to connected users"""
+        while True:
+            socketio.sleep(NOTIFICATION_FLUSH_INTERVAL)
+            self._refresh_clock()
+            try:
+                self._flush_outbox()
+            except Exception as e:
+                logger.error("Failed to flush notification outbox: %s", e)
+
+    def _flush_outbox(self):
+        """Emit each user's pending batch as a single frame"""
+        # Prune expired dedup entries
+        cutoff = self._now_ts - NOTIFICATION_DEDUP_TTL
+        if self._recent_keys:
+            self._recent_keys = {
+                key: ts for key, ts in self._recent_keys.items() if ts >= cutoff
+            }
+
+        if not self._outbox:
+            return
+
+        outbox, self._outbox = self._outbox, {}
+        for user_id, batch in outbox.items():
+            batch = self._dedup_batch(user_id, batch)
+            if batch:
+                socketio.emit('notification_batch', batch, to=f"user:{user_id}",
+                              namespace=NOTIFICATIONS_NAMESPACE)
+
+    @staticmethod
+    def _dedup_key(notification):
+        """Build the key used to suppress duplicate notifications"""
+        data = notification.get('data', {})
+        return (
+            notification.get('type'),
+            notification.get('subtype'),
+            notification.get('message'),
+            data.get('event_id')
+        )
+
+    def _dedup_batch(self, user_id, batch):
+        """Drop notifications already emitted to the user within the TTL"""
+        deduped = []
+        for notification in batch:
+            key = (user_id,) + self._dedup_key(notification)
+            if key in self._recent_keys:
+                continue
+            self._recent_keys[key] = self._now_ts
+            deduped.append(notification)
+        return deduped
+
+    def _pending_queue(self, user_id):
+        """Get (or create) the bounded pending queue for a user"""
+        queue = self.user_notifications.get(user_id)
+        if queue is None:
+            queue = deque(maxlen=MAX_PENDING_PER_USER)
+            self.user_notifications[user_id] = queue
+
+        # Mark the user as most recently active and evict the stalest one
+        # if the global cap is exceeded
+        self.user_notifications.move_to_end(user_id)
+        if len(self.user_notifications) > MAX_PENDING_USERS:
+            evicted_user, _ = self.user_notifications.popitem(last=False)
+            logger.info("Evicted pending notifications for inactive user %s", evicted_user)
+
+        return queue
+
+    def _store_pending(self, user_id, notification):
+        """Store a notification for later delivery to an offline user"""
+        if self._redis is not None:
+            key = f"pending:{user_id}"
+            pipe = self._redis.pipeline()
+            pipe.rpush(key, json.dumps(notification))
+            pipe.ltrim(key, -MAX_PENDING_PER_USER, -1)
+            pipe.execute()
+        else:
+            self._pending_queue(user_id).append(notification)
+
+    def _drain_pending(self, user_id):
+        """Pop and return all pending notifications for a user"""
+        if self._redis is not None:
+            key = f"pending:{user_id}"
+            pipe = self._redis.pipeline()
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            raw, _ = pipe.execute()
+            return [json.loads(item) for item in raw]
+
+        return list(self.user_notifications.pop(user_id, ()))
+
+    def _mark_present(self, user_id):
+        """Record (or refresh) a TTL'd presence entry for a user"""
+        self.connected_user_ids.add(user_id)
+        if self._redis is not None:
+            self._redis.set(f"presence:{user_id}", request.sid, ex=PRESENCE_TTL)
+
+    def _mark_absent(self, user_id):
+        """Drop the presence entry for a user"""
+        self.connected_user_ids.discard(user_id)
+        if self._redis is not None:
+            self._redis.delete(f"presence:{user_id}")
+
+    def _is_connected(self, user_id):
+        """Check whether a user currently has a live connection"""
+        if self._redis is not None:
+            return bool(self._redis.exists(f"presence:{user_id}"))
+        return user_id in self.connected_user_ids
+
+    def _register_socket_handlers(self):
+        """Register SocketIO event handlers"""
+        
+        @socketio.on('connect', namespace=NOTIFICATIONS_NAMESPACE)
+        def handle_connect():
+            """Handle client connection"""
+            user_id = None
+            if current_user.is_authenticated:
+                user_id = current_user.id
+                self._mark_present(user_id)
+
+                # Join rooms so emits can target users without per-SID loops
+                join_room(f"user:{user_id}")
+                join_room(f"role:{current_user.role}")
+                join_room('broadcast')
+
+                logger.info("User %s connected", user_id)
+
+                # Deliver everything queued while offline as one frame
+                pending_notifications = self._drain_pending(user_id)
+                if pending_notifications:
+                    socketio.emit('notification_batch', pending_notifications,
+                                  to=request.sid, namespace=NOTIFICATIONS_NAMESPACE)
+            
+            socketio.emit('connection_established', {'user_id': user_id},
+                          namespace=NOTIFICATIONS_NAMESPACE)
+        
+        @socketio.on('disconnect', namespace=NOTIFICATIONS_NAMESPACE)
+        def handle_disconnect():
+            """Handle client disconnection"""
+            if current_user.is_authenticated:
+                user_id = current_user.id
+                self._mark_absent(user_id)
+                logger.info("User %s disconnected", user_id)
+        
+        @socketio.on('ping', namespace=NOTIFICATIONS_NAMESPACE)
+        def handle_ping():
+            """Refresh the caller's TTL'd presence entry"""
+            if current_user.is_authenticated:
+                self._mark_present(current_user.id)
+
+        @socketio.on('mark_notification_read', namespace=NOTIFICATIONS_NAMESPACE)
+        def handle_mark_read(notification_id):
+            """Handle marking notification as read"""
+            if current_user.is_authenticated:
+                user_id = current_user.id
+                logger.info("User %s marked notification %s as read", user_id, notification_id)
+                socketio.emit('notification_read', {'notification_id': notification_id},
+                              namespace=NOTIFICATIONS_NAMESPACE)
+        
+        @socketio.on('get_user_notifications', namespace=NOTIFICATIONS_NAMESPACE)
+        def handle_get_notifications():
+            """Handle getting user notifications"""
+            if current_user.is_authenticated:
+                user_id = current_user.id
+                notifications = self.get_user_notifications(user_id)
+                socketio.emit('user_notifications', notifications,
+                              room=request.sid, namespace=NOTIFICATIONS_NAMESPACE)
+    
+    def send_notification(self, user_id, notification_data):
+        """
+        Send notification to a specific user
+        
+        Args:
+            user_id (int): User ID
+            notification_data (dict): Notification data
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        try:
+            notification = {
+                'id': f"notif_{self._now_ts}_{next(self._id_counter)}",
+                'user_id': user_id,
+                'type': notification_data.get('type', 'info'),
+                'title': notification_data.get('title', ''),
+                'message': notification_data.get('message', ''),
+                'data': notification_data.get('data', {}),
+                'created_at': self._now_iso,
+                'read': False
+            }
+            
+            # Check if user is connected
+            if self._is_connected(user_id):
+                # Queue for the next batched frame; bursts of notifications
+                # reach the client as one message instead of one frame each
+                batch = self._outbox.setdefault(user_id, [])
+                batch.append(notification)
+                if len(batch) >= NOTIFICATION_BATCH_LIMIT:
+                    self._outbox.pop(user_id, None)
+                    batch = self._dedup_batch(user_id, batch)
+                    if batch:
+                        socketio.emit('notification_batch', batch, to=f"user:{user_id}",
+                                      namespace=NOTIFICATIONS_NAMESPACE)
+                logger.debug("Real-time notification queued for user %s", user_id)
+                return True
+            else:
+                # Store notification for later delivery (bounded per user)
+                self._store_pending(user_id, notification)
+                logger.debug("Notification stored for user %s (offline)", user_id)
+                return True
+                
+        except Exception as e:
+            logger.error("Failed to send notification to user %s: %s", user_id, e)
+            return False
+    
+    def send_broadcast_notification(self, notification_data, user_role=None):
+        """
+        Send broadcast notification to all users or users with specific role
+        
+        Args:
+            notification_data (dict): Notification data
+            user_role (str): User role filter (optional)
+            
+        Returns:
+            int: Number of users notified
+        """
+        try:
+            notification = {
+                'id': f"broadcast_{self._now_ts}_{next(self._id_counter)}",
+                'type': notification_data.get('type', 'info'),
+                'title': notification_data.get('title', ''),
+                'message': notification_data.get('message', ''),
+                'data': notification_data.get('data', {}),
+                'created_at': self._now_iso,
+                'broadcast': True
+            }
+            
+            # One emit to the target room: the payload is serialized once
+            # and fanned out at the transport layer instead of per recipient;
+            # role filtering is just a different room
+            target = f"role:{user_role}" if user_role else 'broadcast'
+            socketio.emit('notification', notification, to=target,
+                          namespace=NOTIFICATIONS_NAMESPACE)
+            notified_count = len(self.connected_user_ids)
+
+            logger.info("Broadcast notification sent to %s users", notified_count)
+            return notified_count
+            
+        except Exception as e:
+            logger.error("Failed to send broadcast notification: %s", e)
+            return 0
+    
+    def send_event_notification(self, event, notification_type, data=None):
+        """
+        Send event-related notification
+        
+        Args:
+            event: Event object
+            notification_type (str): Type of notification
+            data (dict): Additional data
+            
+        Returns:
+            int: Number of users notified
+        """
+        try:
+            if data is None:
+                data = {}
+            
+            notification_data = {
+                'type': 'event',
+                'subtype': notification_type,
+                'title': f"Event Update: {event.title}",
+                'message': self._get_event_message(event, notification_type),
+                'data': {
+                    'event_id': event.id,
+                    'event_title': event.title,
+                    'event_status': event.status,
+                    **data
+                }
+            }
+            
+            # Send to event organizer
+            if event.organizer_id:
+                self.send_notification(event.organizer_id, notification_data)
+            
+            # Guests have no user accounts to notify; iterating
+            # event.guests here only triggered a lazy load of every
+            # guest row for nothing
+            return 1  # Organizer notified
+            
+        except Exception as e:
+            logger.error("Failed to send event notification for %s: %s", event.title, e)
+            return 0
+    
+    def send_payment_notification(self, payment, user_id, notification_type):
+        """
+        Send payment-related notification
+        
+        Args:
+            payment: Payment object
+            user_id (int): User ID
+            notification_type (str): Type of notification
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        try:
+            notification_data = {
+                'type': 'payment',
+                'subtype': notification_type,
+                'title': f"Payment {notification_type.replace('_', ' ').title()}",
+                'message': self._get_payment_message(payment, notification_type),
+                'data': {
+                    'payment_id': payment.id,
+                    'amount': payment.amount,
+                    'payment_type': payment.payment_type,
+                    'transaction_id': payment.transaction_id,
+                    'status': payment.status
+                }
+            }
+            
+            return self.send_notification(user_id, notification_data)
+            
+        except Exception as e:
+            logger.error("Failed to send payment notification: %s", e)
+            return False
+    
+    def send_guest_notification(self, guest, event, notification_type):
+        """
+        Send guest-related notification
+        
+        Args:
+            guest: Guest object
+            event: Event object
+            notification_type (str): Type of notification
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        try:
+            notification_data = {
+                'type': 'guest',
+                'subtype': notification_type,
+                'title': f"Guest {notification_type.replace('_', ' ').title()}",
+                'message': self._get_guest_message(guest, event, notification_type),
+                'data': {
+                    'guest_id': guest.id,
+                    'guest_name': guest.name,
+                    'event_id': event.id,
+                    'event_title': event.title,
+                    'ticket_number': guest.ticket_number
+                }
+            }
+            
+            # Send to event organizer
+            if event.organizer_id:
+                return self.send_notification(event.organizer_id, notification_data)
+            
+            return False
+            
+        except Exception as e:
+            logger.error("Failed to send guest notification: %s", e)
+            return False
+    
+    def get_user_notifications(self, user_id, limit=50):
+        """
+        Get notifications for a user
+        
+        Args:
+            user_id (int): User ID
+            limit (int): Maximum number of notifications
+            
+        Returns:
+            list: User notifications
+        """
+        try:
+            queue = self.user_notifications.get(user_id)
+            if not queue:
+                return []
+            return list(queue)[-limit:]
+
+        except Exception as e:
+            logger.error("Failed to get notifications for user %s: %s", user_id, e)
+            return []
+    
+    def mark_notification_read(self, user_id, notification_id):
+        """
+        Mark notification as read
+        
+        Args:
+            user_id (int): User ID
+            notification_id (str): Notification ID
+            
+        Returns:
+            bool: True if marked successfully, False otherwise
+        """
+        try:
+            # In a real implementation, you would update in database
+            logger.info("Notification %s marked as read for user %s", notification_id, user_id)
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to mark notification %s as read: %s", notification_id, e)
+            return False
+    
+    def _get_event_message(self, event, notification_type):
+        """Get event notification message"""
+        template = _EVENT_TEMPLATES.get(notification_type, _DEFAULT_EVENT_TEMPLATE)
+        return template.format(title=event.title)
+
+    def _get_payment_message(self, payment, notification_type):
+        """Get payment notification message"""
+        template = _PAYMENT_TEMPLATES.get(notification_type, _DEFAULT_PAYMENT_TEMPLATE)
+        return template.format(amount=payment.amount)
+
+    def _get_guest_message(self, guest, event, notification_type):
+        """Get guest notification message"""
+        template = _GUEST_TEMPLATES.get(notification_type, _DEFAULT_GUEST_TEMPLATE)
+        return template.format(name=guest.name, title=event.title)
+    
+    def get_connected_users(self):
+        """
+        Get list of connected users
+        
+        Returns:
+            dict: Connected users
+        """
+        return {
+            'total_connected': len(self.connected_user_ids),
+            'users': list(self.connected_user_ids)
+        }
+    
+    def cleanup_old_notifications(self, days=30):
+        """
+        Clean up old notifications
+        
+        Args:
+            days (int): Number of days to keep notifications
+            
+        Returns:
+            int: Number of notifications cleaned up
+        """
+        try:
+            cutoff_date = datetime.now() - timedelta(days=days)
+            cleaned_count = 0
+
+            # Queues are append-ordered, so old entries sit at the left end
+            for user_id, queue in list(self.user_notifications.items()):
+                while queue and datetime.fromisoformat(queue[0]['created_at']) < cutoff_date:
+                    queue.popleft()
+                    cleaned_count += 1
+                if not queue:
+                    del self.user_notifications[user_id]
+
+            logger.info("Cleaned up %s old notifications", cleaned_count)
+            return cleaned_count
+
+        except Exception as e:
+            logger.error("Failed to cleanup old notifications: %s", e)
+            return 0
+
+# Global notification service instance
 notification_service = NotificationService()
\ No newline at end of file
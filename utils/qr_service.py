@@ -1,400 +1,966 @@
-"""
-QR Code Service Module
-
-This module handles QR code generation for:
-- Guest tickets
-- Event check-ins
-- Vendor badges
-- Payment receipts
-"""
-
-import os
-import qrcode
-import logging
-from datetime import datetime, timedelta
-from flask import current_app
-from PIL import Image, ImageDraw, ImageFont
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class QRService:
-    """QR code service class for generating QR codes"""
-    
-    def __init__(self, app=None):
-        """Initialize the QR service"""
-        self.app = app
-        if app:
-            self.init_app(app)
-    
-    def init_app(self, app):
-        """Initialize with Flask app"""
-        self.app = app
-        
-        # Create QR code output directory if it doesn't exist
-        qr_dir = app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes')
-        os.makedirs(qr_dir, exist_ok=True)
-    
-    def generate_guest_ticket_qr(self, guest, event):
-        """
-        Generate QR code for guest ticket
-        
-        Args:
-            guest: Guest object
-            event: Event object
-            
-        Returns:
-            str: Path to generated QR code image
-        """
-        try:
-            # Create QR code data
-            qr_data = {
-                'type': 'guest_ticket',
-                'ticket_number': guest.ticket_number,
-                'guest_id': guest.id,
-                'event_id': event.id,
-                'guest_name': guest.name,
-                'event_title': event.title,
-                'event_date': event.start_date.isoformat(),
-                'venue': event.venue,
-                'generated_at': datetime.now().isoformat()
-            }
-            
-            # Convert to JSON string
-            import json
-            qr_string = json.dumps(qr_data)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=self.app.config.get('QR_CODE_BOX_SIZE', 10),
-                border=self.app.config.get('QR_CODE_BORDER', 4),
-            )
-            qr.add_data(qr_string)
-            qr.make(fit=True)
-            
-            # Create QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Add text overlay
-            qr_img = self._add_text_overlay(qr_img, guest.ticket_number, guest.name, event.title)
-            
-            # Save QR code
-            filename = f"ticket_{guest.ticket_number}.png"
-            filepath = os.path.join(self.app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes'), filename)
-            qr_img.save(filepath)
-            
-            logger.info(f"Generated QR code for guest {guest.name}, ticket {guest.ticket_number}")
-            return filepath
-            
-        except Exception as e:
-            logger.error(f"Failed to generate QR code for guest {guest.name}: {str(e)}")
-            return None
-    
-    def generate_vendor_badge_qr(self, vendor, event):
-        """
-        Generate QR code for vendor badge
-        
-        Args:
-            vendor: Vendor object
-            event: Event object
-            
-        Returns:
-            str: Path to generated QR code image
-        """
-        try:
-            # Create QR code data
-            qr_data = {
-                'type': 'vendor_badge',
-                'vendor_id': vendor.id,
-                'event_id': event.id,
-                'vendor_name': vendor.name,
-                'service_type': vendor.service_type,
-                'event_title': event.title,
-                'event_date': event.start_date.isoformat(),
-                'venue': event.venue,
-                'generated_at': datetime.now().isoformat()
-            }
-            
-            # Convert to JSON string
-            import json
-            qr_string = json.dumps(qr_data)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=self.app.config.get('QR_CODE_BOX_SIZE', 10),
-                border=self.app.config.get('QR_CODE_BORDER', 4),
-            )
-            qr.add_data(qr_string)
-            qr.make(fit=True)
-            
-            # Create QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Add text overlay
-            qr_img = self._add_text_overlay(qr_img, f"VENDOR-{vendor.id}", vendor.name, event.title)
-            
-            # Save QR code
-            filename = f"vendor_{vendor.id}_{event.id}.png"
-            filepath = os.path.join(self.app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes'), filename)
-            qr_img.save(filepath)
-            
-            logger.info(f"Generated QR code for vendor {vendor.name}")
-            return filepath
-            
-        except Exception as e:
-            logger.error(f"Failed to generate QR code for vendor {vendor.name}: {str(e)}")
-            return None
-    
-    def generate_payment_receipt_qr(self, payment, event):
-        """
-        Generate QR code for payment receipt
-        
-        Args:
-            payment: Payment object
-            event: Event object
-            
-        Returns:
-            str: Path to generated QR code image
-        """
-        try:
-            # Create QR code data
-            qr_data = {
-                'type': 'payment_receipt',
-                'payment_id': payment.id,
-                'event_id': event.id,
-                'transaction_id': payment.transaction_id,
-                'amount': payment.amount,
-                'payment_type': payment.payment_type,
-                'payment_method': payment.payment_method,
-                'status': payment.status,
-                'event_title': event.title,
-                'generated_at': datetime.now().isoformat()
-            }
-            
-            # Convert to JSON string
-            import json
-            qr_string = json.dumps(qr_data)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=self.app.config.get('QR_CODE_BOX_SIZE', 10),
-                border=self.app.config.get('QR_CODE_BORDER', 4),
-            )
-            qr.add_data(qr_string)
-            qr.make(fit=True)
-            
-            # Create QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Add text overlay
-            qr_img = self._add_text_overlay(qr_img, payment.transaction_id, f"PAYMENT ${payment.amount}", event.title)
-            
-            # Save QR code
-            filename = f"payment_{payment.transaction_id}.png"
-            filepath = os.path.join(self.app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes'), filename)
-            qr_img.save(filepath)
-            
-            logger.info(f"Generated QR code for payment {payment.transaction_id}")
-            return filepath
-            
-        except Exception as e:
-            logger.error(f"Failed to generate QR code for payment {payment.transaction_id}: {str(e)}")
-            return None
-    
-    def generate_event_checkin_qr(self, event):
-        """
-        Generate QR code for event check-in station
-        
-        Args:
-            event: Event object
-            
-        Returns:
-            str: Path to generated QR code image
-        """
-        try:
-            # Create QR code data
-            qr_data = {
-                'type': 'event_checkin',
-                'event_id': event.id,
-                'event_title': event.title,
-                'venue': event.venue,
-                'start_date': event.start_date.isoformat(),
-                'end_date': event.end_date.isoformat(),
-                'generated_at': datetime.now().isoformat()
-            }
-            
-            # Convert to JSON string
-            import json
-            qr_string = json.dumps(qr_data)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=self.app.config.get('QR_CODE_BOX_SIZE', 10),
-                border=self.app.config.get('QR_CODE_BORDER', 4),
-            )
-            qr.add_data(qr_string)
-            qr.make(fit=True)
-            
-            # Create QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Add text overlay
-            qr_img = self._add_text_overlay(qr_img, f"CHECKIN-{event.id}", f"Check-in: {event.title}", event.venue)
-            
-            # Save QR code
-            filename = f"checkin_{event.id}.png"
-            filepath = os.path.join(self.app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes'), filename)
-            qr_img.save(filepath)
-            
-            logger.info(f"Generated QR code for event check-in: {event.title}")
-            return filepath
-            
-        except Exception as e:
-            logger.error(f"Failed to generate QR code for event check-in {event.title}: {str(e)}")
-            return None
-    
-    def _add_text_overlay(self, qr_img, code_text, title_text, subtitle_text=""):
-        """
-        Add text overlay to QR code image
-        
-        Args:
-            qr_img: PIL Image object
-            code_text: Text to display as code
-            title_text: Title text
-            subtitle_text: Subtitle text
-            
-        Returns:
-            PIL Image object with text overlay
-        """
-        try:
-            # Convert to RGB mode for better text rendering
-            qr_img = qr_img.convert('RGB')
-            
-            # Create a new image with space for text
-            img_width, img_height = qr_img.size
-            new_height = img_height + 80  # Add space for text
-            new_img = Image.new('RGB', (img_width, new_height), 'white')
-            
-            # Paste QR code on the new image
-            new_img.paste(qr_img, (0, 0))
-            
-            # Create drawing context
-            draw = ImageDraw.Draw(new_img)
-            
-            # Try to use a default font, fall back to basic font
-            try:
-                font_large = ImageFont.truetype("arial.ttf", 16)
-                font_small = ImageFont.truetype("arial.ttf", 12)
-            except:
-                font_large = ImageFont.load_default()
-                font_small = ImageFont.load_default()
-            
-            # Add code text
-            code_bbox = draw.textbbox((0, 0), code_text, font=font_large)
-            code_width = code_bbox[2] - code_bbox[0]
-            draw.text(((img_width - code_width) // 2, img_height + 10), code_text, font=font_large, fill='black')
-            
-            # Add title text
-            if title_text:
-                # Truncate title if too long
-                if len(title_text) > 30:
-                    title_text = title_text[:27] + "..."
-                
-                title_bbox = draw.textbbox((0, 0), title_text, font=font_small)
-                title_width = title_bbox[2] - title_bbox[0]
-                draw.text(((img_width - title_width) // 2, img_height + 35), title_text, font=font_small, fill='black')
-            
-            # Add subtitle text
-            if subtitle_text:
-                if len(subtitle_text) > 40:
-                    subtitle_text = subtitle_text[:37] + "..."
-                
-                subtitle_bbox = draw.textbbox((0, 0), subtitle_text, font=font_small)
-                subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-                draw.text(((img_width - subtitle_width) // 2, img_height + 55), subtitle_text, font=font_small, fill='gray')
-            
-            return new_img
-            
-        except Exception as e:
-            logger.error(f"Failed to add text overlay: {str(e)}")
-            return qr_img  # Return original image if text overlay fails
-    
-    def decode_qr_code(self, qr_image_path):
-        """
-        Decode QR code from image file
-        
-        Args:
-            qr_image_path: Path to QR code image file
-            
-        Returns:
-            dict: Decoded QR code data
-        """
-        try:
-            import json
-            from PIL import Image
-            
-            # Open image file
-            img = Image.open(qr_image_path)
-            
-            # Decode QR code
-            from pyzbar.pyzbar import decode
-            decoded_objects = decode(img)
-            
-            if decoded_objects:
-                qr_data = json.loads(decoded_objects[0].data.decode('utf-8'))
-                return qr_data
-            else:
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to decode QR code from {qr_image_path}: {str(e)}")
-            return None
-    
-    def validate_qr_code(self, qr_data, expected_type=None):
-        """
-        Validate QR code data
-        
-        Args:
-            qr_data: Decoded QR code data
-            expected_type: Expected QR code type
-            
-        Returns:
-            tuple: (is_valid, error_message)
-        """
-        try:
-            # Check if QR data is a dictionary
-            if not isinstance(qr_data, dict):
-                return False, "Invalid QR code format"
-            
-            # Check required fields
-            required_fields = ['type', 'generated_at']
-            for field in required_fields:
-                if field not in qr_data:
-                    return False, f"Missing required field: {field}"
-            
-            # Check QR code type if specified
-            if expected_type and qr_data.get('type') != expected_type:
-                return False, f"Invalid QR code type. Expected: {expected_type}, Got: {qr_data.get('type')}"
-            
-            # Check if QR code is expired (24 hours validity)
-            generated_at = datetime.fromisoformat(qr_data['generated_at'])
-            if datetime.now() - generated_at > timedelta(hours=24):
-                return False, "QR code has expired"
-            
-            return True, "Valid QR code"
-            
-        except Exception as e:
-            logger.error(f"Failed to validate QR code: {str(e)}")
-            return False, f"Validation error: {str(e)}"
-
-# Global QR service instance
+"""
+QR Code Service Module
+
+This module handles QR code generation for:
+- Guest tickets
+- Event check-ins
+- Vendor badges
+- Payment receipts
+"""
+
+import os
+import copy
+import hmac
+import json
+import shutil
+import hashlib
+import time
+import struct
+import qrcode
+import logging
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from flask import current_app
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from pyzbar.pyzbar import decode as _pyzbar_decode
+    PYZBAR_AVAILABLE = True
+except ImportError:
+    PYZBAR_AVAILABLE = False
+
+try:
+    import zxingcpp
+    ZXINGCPP_AVAILABLE = True
+except ImportError:
+    ZXINGCPP_AVAILABLE = False
+
+try:
+    import segno
+    SEGNO_AVAILABLE = True
+except ImportError:
+    SEGNO_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bound once at import time so hot paths skip the attribute chain
+_ERROR_CORRECT_L = qrcode.constants.ERROR_CORRECT_L
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _lost_point_jit(m):
+        """Mask-penalty score for a QR module matrix (the four ISO rules)"""
+        n = m.shape[0]
+        lost = 0
+
+        # Rule 1: runs of five or more same-colored modules per row/column
+        for r in range(n):
+            run = 1
+            for c in range(1, n):
+                if m[r, c] == m[r, c - 1]:
+                    run += 1
+                else:
+                    if run >= 5:
+                        lost += 3 + (run - 5)
+                    run = 1
+            if run >= 5:
+                lost += 3 + (run - 5)
+        for c in range(n):
+            run = 1
+            for r in range(1, n):
+                if m[r, c] == m[r - 1, c]:
+                    run += 1
+                else:
+                    if run >= 5:
+                        lost += 3 + (run - 5)
+                    run = 1
+            if run >= 5:
+                lost += 3 + (run - 5)
+
+        # Rule 2: 2x2 blocks of a single color
+        for r in range(n - 1):
+            for c in range(n - 1):
+                v = m[r, c]
+                if m[r, c + 1] == v and m[r + 1, c] == v and m[r + 1, c + 1] == v:
+                    lost += 3
+
+        # Rule 3: finder-like 1:1:3:1:1 pattern with four light modules
+        # on one side
+        for r in range(n):
+            for c in range(n - 10):
+                if (m[r, c] != 0 and m[r, c + 1] == 0 and m[r, c + 2] != 0
+                        and m[r, c + 3] != 0 and m[r, c + 4] != 0
+                        and m[r, c + 5] == 0 and m[r, c + 6] != 0
+                        and m[r, c + 7] == 0 and m[r, c + 8] == 0
+                        and m[r, c + 9] == 0 and m[r, c + 10] == 0):
+                    lost += 40
+                if (m[r, c] == 0 and m[r, c + 1] == 0 and m[r, c + 2] == 0
+                        and m[r, c + 3] == 0 and m[r, c + 4] != 0
+                        and m[r, c + 5] == 0 and m[r, c + 6] != 0
+                        and m[r, c + 7] != 0 and m[r, c + 8] != 0
+                        and m[r, c + 9] == 0 and m[r, c + 10] != 0):
+                    lost += 40
+        for c in range(n):
+            for r in range(n - 10):
+                if (m[r, c] != 0 and m[r + 1, c] == 0 and m[r + 2, c] != 0
+                        and m[r + 3, c] != 0 and m[r + 4, c] != 0
+                        and m[r + 5, c] == 0 and m[r + 6, c] != 0
+                        and m[r + 7, c] == 0 and m[r + 8, c] == 0
+                        and m[r + 9, c] == 0 and m[r + 10, c] == 0):
+                    lost += 40
+                if (m[r, c] == 0 and m[r + 1, c] == 0 and m[r + 2, c] == 0
+                        and m[r + 3, c] == 0 and m[r + 4, c] != 0
+                        and m[r + 5, c] == 0 and m[r + 6, c] != 0
+                        and m[r + 7, c] != 0 and m[r + 8, c] != 0
+                        and m[r + 9, c] == 0 and m[r + 10, c] != 0):
+                    lost += 40
+
+        # Rule 4: dark-module ratio deviation from 50%
+        dark = 0
+        for r in range(n):
+            for c in range(n):
+                if m[r, c] != 0:
+                    dark += 1
+        lost += (abs(100 * dark // (n * n) - 50) // 5) * 10
+        return lost
+
+    def _numba_lost_point(modules):
+        """Drop-in replacement for qrcode.util.lost_point"""
+        return int(_lost_point_jit(np.asarray(modules, dtype=np.uint8)))
+
+# Whether to encode with a fixed mask pattern instead of scoring all
+# eight; snapshotted from config in init_app
+_SKIP_MASK_PATTERN = True
+
+def _make_qr(qr):
+    """Build the QR symbol, optionally skipping the eight-mask search
+
+    These codes are machine-scanned, so the aesthetic mask choice is
+    wasted work; mask 0 at the best-fit version is equally valid and
+    skips eight full penalty scans.
+    """
+    if _SKIP_MASK_PATTERN:
+        qr.best_fit()
+        qr.makeImpl(False, 0)
+    else:
+        qr.make(fit=True)
+
+# Compact payload format: a version prefix, then a type tag, two record
+# ids and a generation timestamp, HMAC-signed and base45-encoded so the
+# whole payload fits the dense alphanumeric QR mode. Shorter payloads
+# mean a smaller QR version and quadratically fewer modules to build;
+# anything beyond the ids is looked up server-side at scan time.
+_PAYLOAD_PREFIX = 'EVP1:'
+_PAYLOAD_STRUCT = struct.Struct('<BIIQ')
+_PAYLOAD_MAC_BYTES = 8
+
+_QR_TYPE_TAGS = {
+    'guest_ticket': 1,
+    'vendor_badge': 2,
+    'payment_receipt': 3,
+    'event_checkin': 4,
+}
+_QR_TAG_TYPES = {tag: name for name, tag in _QR_TYPE_TAGS.items()}
+_QR_PRIMARY_FIELDS = {
+    'guest_ticket': 'guest_id',
+    'vendor_badge': 'vendor_id',
+    'payment_receipt': 'payment_id',
+    'event_checkin': 'event_id',
+}
+
+# Base45 alphabet (RFC 9285); every character is in the QR alphanumeric set
+_B45_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_B45_INDEX = {c: i for i, c in enumerate(_B45_ALPHABET)}
+
+def _b45encode(data):
+    """Encode bytes as a base45 (RFC 9285) string"""
+    chars = []
+    for i in range(0, len(data) - 1, 2):
+        x = data[i] * 256 + data[i + 1]
+        x, c0 = divmod(x, 45)
+        x, c1 = divmod(x, 45)
+        chars.append(_B45_ALPHABET[c0])
+        chars.append(_B45_ALPHABET[c1])
+        chars.append(_B45_ALPHABET[x])
+    if len(data) % 2:
+        x, c0 = divmod(data[-1], 45)
+        chars.append(_B45_ALPHABET[c0])
+        chars.append(_B45_ALPHABET[x])
+    return ''.join(chars)
+
+def _b45decode(text):
+    """Decode a base45 (RFC 9285) string to bytes"""
+    if len(text) % 3 == 1:
+        raise ValueError("Invalid base45 length")
+    out = bytearray()
+    for i in range(0, len(text) - 2, 3):
+        x = (_B45_INDEX[text[i]] + _B45_INDEX[text[i + 1]] * 45
+             + _B45_INDEX[text[i + 2]] * 45 * 45)
+        out += x.to_bytes(2, 'big')
+    if len(text) % 3 == 2:
+        out.append(_B45_INDEX[text[-2]] + _B45_INDEX[text[-1]] * 45)
+    return bytes(out)
+
+def _generation_epoch():
+    """Hour-bucketed generation timestamp for QR payloads
+
+    Keeping minute/second precision out of the payload lets identical
+    ticket data map to the same cached render within the hour instead of
+    missing the cache on every call.
+    """
+    return int(time.time()) // 3600 * 3600
+
+@lru_cache(maxsize=None)
+def _get_font(size):
+    """Load (once) the overlay font at a given size
+
+    Loading a TrueType face opens the file and parses it through
+    FreeType; caching makes every overlay after the first reuse the same
+    face object.
+    """
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+# Bound for the generated-path -> payload map used by decode_qr_code
+_PAYLOAD_MAP_LIMIT = 4096
+
+# File extensions decode_qr_code will even attempt to open
+_DECODABLE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp'})
+
+@lru_cache(maxsize=2048)
+def _decode_image(qr_image_path, mtime_ns):
+    """Decode the QR payload text from an image file, memoized
+
+    Keyed by (path, mtime) so re-scans of the same ticket image (retry,
+    duplicate-scan detection) are dictionary lookups. Decoders only read
+    luminance, so the image is collapsed to grayscale once up front;
+    zxing-cpp is preferred over pyzbar when installed for its faster
+    binarization.
+    """
+    img = Image.open(qr_image_path).convert('L')
+    if ZXINGCPP_AVAILABLE:
+        result = zxingcpp.read_barcode(img)
+        return result.text if result else None
+    decoded_objects = _pyzbar_decode(img)
+    if decoded_objects:
+        return decoded_objects[0].data.decode('utf-8')
+    return None
+
+def _save_png(img, filepath):
+    """Write a QR image as PNG with fast encoder settings
+
+    QR images are flat black/white regions, so zlib level 1 compresses
+    them nearly as well as the default level 6 at a fraction of the CPU;
+    the files stay a few KB either way.
+    """
+    img.save(filepath, format='PNG', optimize=False, compress_level=1)
+
+@lru_cache(maxsize=None)
+def _qr_template(box_size, border):
+    """Pre-configured QRCode prototype for a box/border pair"""
+    return qrcode.QRCode(
+        version=1,
+        error_correction=_ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+
+@lru_cache(maxsize=1024)
+def _qr_matrix(qr_string):
+    """Encode a payload into its module matrix, memoized
+
+    Symbol construction (and the mask search when enabled) dominates QR
+    generation time, so repeated payloads skip it entirely on a cache
+    hit. The matrix is borderless uint8; callers must not mutate it.
+    """
+    if SEGNO_AVAILABLE:
+        # segno builds the module matrix roughly an order of magnitude
+        # faster than qrcode for the small versions these payloads
+        # produce; its matrix carries no border, matching qr.modules
+        symbol = segno.make_qr(qr_string, error='l', boost_error=False,
+                               mask=0 if _SKIP_MASK_PATTERN else None)
+        return np.array(symbol.matrix, dtype=np.uint8)
+
+    # Clone the shared prototype instead of re-running constructor
+    # setup; qr.modules is the bare matrix (get_matrix would add the
+    # border a second time)
+    qr = copy.copy(_qr_template(1, 0))
+    qr.clear()
+    qr.add_data(qr_string)
+    _make_qr(qr)
+    return np.array(qr.modules, dtype=np.uint8)
+
+@lru_cache(maxsize=1024)
+def _render_qr(qr_string, box_size, border):
+    """Render a QR code image for a payload string, memoized
+
+    Args:
+        qr_string (str): Payload to encode
+        box_size (int): Pixels per QR module
+        border (int): Border width in modules
+
+    Returns:
+        PIL Image object (callers must copy before mutating)
+    """
+    # Rasterize the module matrix in one vectorized upscale instead of
+    # qrcode's module-by-module PIL drawing: dark modules become 0, light
+    # 255, each module is blown up to box_size pixels and the quiet zone
+    # is padded on afterwards
+    matrix = _qr_matrix(qr_string)
+    pixels = 255 - 255 * np.kron(matrix, np.ones((box_size, box_size), dtype=np.uint8))
+    pixels = np.pad(pixels, border * box_size, constant_values=255)
+    return Image.fromarray(pixels, mode='L').convert('RGB')
+
+def _render_qr_svg(qr_string, box_size, border):
+    """Render a QR code as a compact SVG document string
+
+    Built straight from the module matrix as a single path of unit
+    squares scaled through the viewBox; no PIL and no zlib, and the
+    result is a fraction of the PNG's size for web delivery.
+    """
+    matrix = _qr_matrix(qr_string)
+    side = matrix.shape[0] + 2 * border
+    size = side * box_size
+    path = ''.join(
+        f'M{c + border},{r + border}h1v1h-1z'
+        for r, row in enumerate(matrix)
+        for c, v in enumerate(row) if v
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {side} {side}">'
+        f'<rect width="{side}" height="{side}" fill="#fff"/>'
+        f'<path d="{path}" fill="#000"/></svg>'
+    )
+
+def _batch_render_matrices(matrices, box_size, border):
+    """Rasterize many module matrices with one upscale per symbol size
+
+    Matrices are grouped by side length (payloads in one batch nearly
+    always share a version), stacked into an (N, side, side) array, and
+    upscaled plus padded with a single np.kron/np.pad per group instead
+    of one rasterization pipeline per code.
+
+    Args:
+        matrices: Sequence of borderless uint8 module matrices
+        box_size (int): Pixels per QR module
+        border (int): Border width in modules
+
+    Returns:
+        list: PIL Image objects in input order
+    """
+    images = [None] * len(matrices)
+    groups = {}
+    for idx, matrix in enumerate(matrices):
+        groups.setdefault(matrix.shape[0], []).append((idx, matrix))
+
+    block = np.ones((box_size, box_size), dtype=np.uint8)
+    pad = border * box_size
+    for members in groups.values():
+        stack = np.stack([matrix for _, matrix in members])
+        pixels = 255 - 255 * np.kron(stack, block)
+        pixels = np.pad(pixels, ((0, 0), (pad, pad), (pad, pad)), constant_values=255)
+        for (idx, _), frame in zip(members, pixels):
+            images[idx] = Image.fromarray(frame, mode='L').convert('RGB')
+    return images
+
+class QRService:
+    """QR code service class for generating QR codes"""
+    
+    def __init__(self, app=None):
+        """Initialize the QR service"""
+        self.app = app
+        # (subtitle, qr size) -> pre-painted overlay canvas
+        self._overlay_templates = {}
+        # Generated file path -> payload string, so decoding our own
+        # images never re-reads the PNG
+        self._payload_by_path = OrderedDict()
+        if app:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Initialize with Flask app"""
+        self.app = app
+        
+        # Snapshot the QR settings once; generators run in batches and
+        # should not pay a config lookup per code
+        self._box_size = app.config.get('QR_CODE_BOX_SIZE', 10)
+        self._border = app.config.get('QR_CODE_BORDER', 4)
+        # Kept with a trailing separator so filenames concatenate
+        # directly instead of going through os.path.join per code
+        self._qr_dir = os.path.join(app.config.get('QR_CODE_OUTPUT_DIR', 'static/qrcodes'), '')
+
+        # Create QR code output directory if it doesn't exist
+        os.makedirs(self._qr_dir, exist_ok=True)
+
+        global _SKIP_MASK_PATTERN
+        _SKIP_MASK_PATTERN = app.config.get('QR_SKIP_MASK_PATTERN', True)
+
+        # Mask-pattern search spends nearly all of its time in
+        # lost_point's pure-Python grid scans; swap in the jitted version
+        # when numba is installed (cache=True avoids recompiling on boot)
+        if NUMBA_AVAILABLE:
+            qrcode.util.lost_point = _numba_lost_point
+
+        # Key for signing compact QR payloads
+        self._hmac_key = (app.config.get('SECRET_KEY') or '').encode()
+
+        # Pre-warm the overlay fonts so the first QR request does not
+        # pay the FreeType face load
+        _get_font(16)
+        _get_font(12)
+    
+    def _pack_payload(self, type_name, primary_id, event_id, ts=None):
+        """
+        Build the signed compact QR payload for a record
+        
+        Args:
+            type_name (str): QR code type name
+            primary_id (int): Id of the ticketed/badged record
+            event_id (int): Related event id
+            ts (int): Generation epoch; defaults to the hour bucket
+            
+        Returns:
+            str: Prefixed base45 payload string
+        """
+        if ts is None:
+            ts = _generation_epoch()
+        packed = _PAYLOAD_STRUCT.pack(_QR_TYPE_TAGS[type_name], primary_id, event_id, ts)
+        mac = hmac.new(self._hmac_key, packed, 'sha256').digest()[:_PAYLOAD_MAC_BYTES]
+        return _PAYLOAD_PREFIX + _b45encode(packed + mac)
+    
+    def _unpack_payload(self, qr_string):
+        """
+        Decode and verify a compact QR payload
+        
+        Args:
+            qr_string (str): Prefixed base45 payload string
+            
+        Returns:
+            dict: Decoded QR code data or None if invalid
+        """
+        try:
+            raw = _b45decode(qr_string[len(_PAYLOAD_PREFIX):])
+            packed, mac = raw[:_PAYLOAD_STRUCT.size], raw[_PAYLOAD_STRUCT.size:]
+            expected = hmac.new(self._hmac_key, packed, 'sha256').digest()[:_PAYLOAD_MAC_BYTES]
+            if not hmac.compare_digest(mac, expected):
+                logger.error("QR payload failed signature check")
+                return None
+            
+            tag, primary_id, event_id, ts = _PAYLOAD_STRUCT.unpack(packed)
+            type_name = _QR_TAG_TYPES.get(tag)
+            if type_name is None:
+                return None
+            
+            qr_data = {
+                'type': type_name,
+                'event_id': event_id,
+                'ts': ts,
+                'generated_at': datetime.fromtimestamp(ts).isoformat()
+            }
+            qr_data[_QR_PRIMARY_FIELDS[type_name]] = primary_id
+            return qr_data
+            
+        except (ValueError, KeyError, struct.error) as e:
+            logger.error(f"Failed to unpack QR payload: {str(e)}")
+            return None
+    
+    def _remember_payload(self, filepath, qr_string):
+        """Record a generated file's payload so decoding it is a lookup"""
+        cache = self._payload_by_path
+        cache[filepath] = qr_string
+        cache.move_to_end(filepath)
+        if len(cache) > _PAYLOAD_MAP_LIMIT:
+            cache.popitem(last=False)
+    
+    def _canonical_qr_path(self, qr_string):
+        """
+        Content-addressed storage path for a payload's rendered image
+        
+        Args:
+            qr_string (str): QR payload string
+            
+        Returns:
+            str: Canonical path derived from the payload hash
+        """
+        digest = hashlib.blake2b(qr_string.encode(), digest_size=16).hexdigest()
+        subdir = f"{self._qr_dir}{digest[:2]}"
+        os.makedirs(subdir, exist_ok=True)
+        return f"{subdir}{os.sep}{digest}.png"
+    
+    @staticmethod
+    def _link_friendly(canonical, filepath):
+        """Expose a canonical image under its friendly name via hard link"""
+        try:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            os.link(canonical, filepath)
+        except OSError:
+            shutil.copyfile(canonical, filepath)
+    
+    @classmethod
+    def _write_and_link(cls, qr_img, canonical, filepath):
+        """Save the canonical image then expose its friendly name"""
+        _save_png(qr_img, canonical)
+        cls._link_friendly(canonical, filepath)
+    
+    def generate_guest_ticket_qr(self, guest, event):
+        """
+        Generate QR code for guest ticket
+        
+        Args:
+            guest: Guest object
+            event: Event object
+            
+        Returns:
+            str: Path to generated QR code image
+        """
+        try:
+            # Compact signed payload; ticket details are looked up by id
+            # at scan time
+            qr_string = self._pack_payload('guest_ticket', guest.id, event.id)
+            
+            filepath = f"{self._qr_dir}ticket_{guest.ticket_number}.png"
+            
+            # Render only when the content-addressed copy is missing;
+            # regeneration becomes a hard link to the existing bytes
+            canonical = self._canonical_qr_path(qr_string)
+            if not os.path.exists(canonical):
+                qr_img = _render_qr(qr_string, self._box_size, self._border).copy()
+                qr_img = self._add_text_overlay(qr_img, guest.ticket_number, guest.name, event.title)
+                _save_png(qr_img, canonical)
+            self._link_friendly(canonical, filepath)
+            self._remember_payload(filepath, qr_string)
+            
+            logger.info(f"Generated QR code for guest {guest.name}, ticket {guest.ticket_number}")
+            return filepath
+            
+        except Exception as e:
+            logger.error(f"Failed to generate QR code for guest {guest.name}: {str(e)}")
+            return None
+    
+    def generate_guest_ticket_qr_svg(self, guest, event):
+        """
+        Generate an SVG ticket QR for web delivery
+        
+        Args:
+            guest: Guest object
+            event: Event object
+            
+        Returns:
+            str: SVG document markup or None if failed
+        """
+        try:
+            qr_string = self._pack_payload('guest_ticket', guest.id, event.id)
+            return _render_qr_svg(qr_string, self._box_size, self._border)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate SVG QR code for guest {guest.name}: {str(e)}")
+            return None
+    
+    def generate_guest_ticket_qrs(self, guests, event):
+        """
+        Generate ticket QR codes for many guests in one batch
+        
+        Rendering is CPU-bound pure Python, so all payloads are built up
+        front and dispatched across a process pool; finished images are
+        overlaid here and written from a thread pool so PNG encoding and
+        disk I/O overlap instead of serializing per guest.
+        
+        Args:
+            guests: Iterable of Guest objects
+            event: Event object
+            
+        Returns:
+            dict: Guest id mapped to generated QR code path
+        """
+        try:
+            stamp = _generation_epoch()
+            
+            jobs = [
+                (guest, self._pack_payload('guest_ticket', guest.id, event.id, ts=stamp))
+                for guest in guests
+            ]
+            
+            # Serve duplicates straight from the content-addressed store
+            # and only render the rest
+            results = {}
+            to_render = []
+            for guest, qr_string in jobs:
+                filepath = f"{self._qr_dir}ticket_{guest.ticket_number}.png"
+                canonical = self._canonical_qr_path(qr_string)
+                results[guest.id] = filepath
+                self._remember_payload(filepath, qr_string)
+                if os.path.exists(canonical):
+                    self._link_friendly(canonical, filepath)
+                else:
+                    to_render.append((guest, qr_string, canonical, filepath))
+            
+            if to_render:
+                # Encode matrices across the process pool, then rasterize
+                # them all with the stacked kernel and overlap the writes
+                with ProcessPoolExecutor() as pool:
+                    matrices = list(pool.map(
+                        _qr_matrix,
+                        [qr_string for _, qr_string, _, _ in to_render],
+                        chunksize=16
+                    ))
+                images = _batch_render_matrices(matrices, self._box_size, self._border)
+                with ThreadPoolExecutor() as writers:
+                    for (guest, _, canonical, filepath), qr_img in zip(to_render, images):
+                        qr_img = self._add_text_overlay(qr_img, guest.ticket_number, guest.name, event.title)
+                        writers.submit(self._write_and_link, qr_img, canonical, filepath)
+            
+            logger.info(f"Generated {len(results)} ticket QR codes for event {event.id}")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Failed to batch-generate ticket QR codes for event {event.id}: {str(e)}")
+            return {}
+    
+    def generate_vendor_badge_qr(self, vendor, event):
+        """
+        Generate QR code for vendor badge
+        
+        Args:
+            vendor: Vendor object
+            event: Event object
+            
+        Returns:
+            str: Path to generated QR code image
+        """
+        try:
+            # Compact signed payload; badge details are looked up by id
+            # at scan time
+            qr_string = self._pack_payload('vendor_badge', vendor.id, event.id)
+            
+            filepath = f"{self._qr_dir}vendor_{vendor.id}_{event.id}.png"
+            
+            # Render only when the content-addressed copy is missing;
+            # regeneration becomes a hard link to the existing bytes
+            canonical = self._canonical_qr_path(qr_string)
+            if not os.path.exists(canonical):
+                qr_img = _render_qr(qr_string, self._box_size, self._border).copy()
+                qr_img = self._add_text_overlay(qr_img, f"VENDOR-{vendor.id}", vendor.name, event.title)
+                _save_png(qr_img, canonical)
+            self._link_friendly(canonical, filepath)
+            self._remember_payload(filepath, qr_string)
+            
+            logger.info(f"Generated QR code for vendor {vendor.name}")
+            return filepath
+            
+        except Exception as e:
+            logger.error(f"Failed to generate QR code for vendor {vendor.name}: {str(e)}")
+            return None
+    
+    def generate_vendor_badge_qr_svg(self, vendor, event):
+        """
+        Generate an SVG vendor badge QR for web delivery
+        
+        Args:
+            vendor: Vendor object
+            event: Event object
+            
+        Returns:
+            str: SVG document markup or None if failed
+        """
+        try:
+            qr_string = self._pack_payload('vendor_badge', vendor.id, event.id)
+            return _render_qr_svg(qr_string, self._box_size, self._border)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate SVG QR code for vendor {vendor.name}: {str(e)}")
+            return None
+    
+    def generate_payment_receipt_qr(self, payment, event):
+        """
+        Generate QR code for payment receipt
+        
+        Args:
+            payment: Payment object
+            event: Event object
+            
+        Returns:
+            str: Path to generated QR code image
+        """
+        try:
+            # Compact signed payload; receipt details are looked up by id
+            # at scan time
+            qr_string = self._pack_payload('payment_receipt', payment.id, event.id)
+            
+            filepath = f"{self._qr_dir}payment_{payment.transaction_id}.png"
+            
+            # Render only when the content-addressed copy is missing;
+            # regeneration becomes a hard link to the existing bytes
+            canonical = self._canonical_qr_path(qr_string)
+            if not os.path.exists(canonical):
+                qr_img = _render_qr(qr_string, self._box_size, self._border).copy()
+                qr_img = self._add_text_overlay(qr_img, payment.transaction_id, f"PAYMENT ${payment.amount}", event.title)
+                _save_png(qr_img, canonical)
+            self._link_friendly(canonical, filepath)
+            self._remember_payload(filepath, qr_string)
+            
+            logger.info(f"Generated QR code for payment {payment.transaction_id}")
+            return filepath
+            
+        except Exception as e:
+            logger.error(f"Failed to generate QR code for payment {payment.transaction_id}: {str(e)}")
+            return None
+    
+    def generate_payment_receipt_qr_svg(self, payment, event):
+        """
+        Generate an SVG payment receipt QR for web delivery
+        
+        Args:
+            payment: Payment object
+            event: Event object
+            
+        Returns:
+            str: SVG document markup or None if failed
+        """
+        try:
+            qr_string = self._pack_payload('payment_receipt', payment.id, event.id)
+            return _render_qr_svg(qr_string, self._box_size, self._border)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate SVG QR code for payment {payment.transaction_id}: {str(e)}")
+            return None
+    
+    def generate_event_checkin_qr(self, event):
+        """
+        Generate QR code for event check-in station
+        
+        Args:
+            event: Event object
+            
+        Returns:
+            str: Path to generated QR code image
+        """
+        try:
+            # Compact signed payload; event details are looked up by id
+            # at scan time
+            qr_string = self._pack_payload('event_checkin', event.id, event.id)
+            
+            filepath = f"{self._qr_dir}checkin_{event.id}.png"
+            
+            # Render only when the content-addressed copy is missing;
+            # regeneration becomes a hard link to the existing bytes
+            canonical = self._canonical_qr_path(qr_string)
+            if not os.path.exists(canonical):
+                qr_img = _render_qr(qr_string, self._box_size, self._border).copy()
+                qr_img = self._add_text_overlay(qr_img, f"CHECKIN-{event.id}", f"Check-in: {event.title}", event.venue)
+                _save_png(qr_img, canonical)
+            self._link_friendly(canonical, filepath)
+            self._remember_payload(filepath, qr_string)
+            
+            logger.info(f"Generated QR code for event check-in: {event.title}")
+            return filepath
+            
+        except Exception as e:
+            logger.error(f"Failed to generate QR code for event check-in {event.title}: {str(e)}")
+            return None
+    
+    def generate_event_checkin_qr_svg(self, event):
+        """
+        Generate an SVG check-in QR for web delivery
+        
+        Args:
+            event: Event object
+            
+        Returns:
+            str: SVG document markup or None if failed
+        """
+        try:
+            qr_string = self._pack_payload('event_checkin', event.id, event.id)
+            return _render_qr_svg(qr_string, self._box_size, self._border)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate SVG QR code for event check-in {event.title}: {str(e)}")
+            return None
+    
+    def _overlay_template(self, subtitle_text, size):
+        """
+        Get (or build) the overlay canvas for a subtitle and QR size
+        
+        Every ticket for one event shares the same subtitle line, so the
+        white canvas with the subtitle already drawn is built once per
+        (subtitle, size) pair and copied per code.
+        
+        Args:
+            subtitle_text: Subtitle text (usually the event title)
+            size: (width, height) of the QR image
+            
+        Returns:
+            PIL Image object with the subtitle pre-drawn
+        """
+        key = (subtitle_text, size)
+        template = self._overlay_templates.get(key)
+        if template is None:
+            img_width, img_height = size
+            canvas = Image.fromarray(
+                np.full((img_height + 80, img_width, 3), 255, dtype=np.uint8)
+            )
+            if subtitle_text:
+                if len(subtitle_text) > 40:
+                    subtitle_text = subtitle_text[:37] + "..."
+                
+                draw = ImageDraw.Draw(canvas)
+                font_small = _get_font(12)
+                subtitle_width = font_small.getlength(subtitle_text)
+                draw.text(((img_width - subtitle_width) // 2, img_height + 55), subtitle_text, font=font_small, fill=(128, 128, 128))
+            # Stored as a pixel array so per-code composition is a plain
+            # array copy plus one slice assignment
+            template = np.asarray(canvas)
+            self._overlay_templates[key] = template
+        return template
+    
+    def _add_text_overlay(self, qr_img, code_text, title_text, subtitle_text=""):
+        """
+        Add text overlay to QR code image
+        
+        Args:
+            qr_img: PIL Image object
+            code_text: Text to display as code
+            title_text: Title text
+            subtitle_text: Subtitle text
+            
+        Returns:
+            PIL Image object with text overlay
+        """
+        try:
+            # Convert to RGB mode for better text rendering
+            qr_img = qr_img.convert('RGB')
+            img_width, img_height = qr_img.size
+            
+            # Copy the pre-painted pixel array (static subtitle already
+            # drawn) and drop the QR into its slot with one slice
+            # assignment; only the two per-record strings remain to draw
+            canvas = self._overlay_template(subtitle_text, qr_img.size).copy()
+            canvas[:img_height] = np.asarray(qr_img)
+            new_img = Image.fromarray(canvas)
+            
+            # Create drawing context
+            draw = ImageDraw.Draw(new_img)
+            
+            # Cached font faces; falls back to PIL's default face if the
+            # TrueType file is unavailable
+            font_large = _get_font(16)
+            font_small = _get_font(12)
+            
+            # Add code text; getlength is a single C-level width query
+            code_width = font_large.getlength(code_text)
+            draw.text(((img_width - code_width) // 2, img_height + 10), code_text, font=font_large, fill=(0, 0, 0))
+            
+            # Add title text
+            if title_text:
+                # Truncate title if too long
+                if len(title_text) > 30:
+                    title_text = title_text[:27] + "..."
+                
+                title_width = font_small.getlength(title_text)
+                draw.text(((img_width - title_width) // 2, img_height + 35), title_text, font=font_small, fill=(0, 0, 0))
+            
+            return new_img
+            
+        except Exception as e:
+            logger.error(f"Failed to add text overlay: {str(e)}")
+            return qr_img  # Return original image if text overlay fails
+    
+    def decode_qr_code(self, qr_image_path):
+        """
+        Decode QR code from image file
+        
+        Args:
+            qr_image_path: Path to QR code image file
+            
+        Returns:
+            dict: Decoded QR code data
+        """
+        try:
+            # Images generated by this process decode without touching
+            # the file at all
+            qr_text = self._payload_by_path.get(qr_image_path)
+            
+            if qr_text is None:
+                ext = os.path.splitext(qr_image_path)[1].lower()
+                if ext not in _DECODABLE_EXTENSIONS:
+                    return None
+                qr_text = _decode_image(qr_image_path, os.stat(qr_image_path).st_mtime_ns)
+            
+            if qr_text is None:
+                return None
+            
+            if qr_text.startswith(_PAYLOAD_PREFIX):
+                return self._unpack_payload(qr_text)
+            # Older images carry the verbose JSON payload
+            return _json_loads(qr_text)
+                
+        except Exception as e:
+            logger.error(f"Failed to decode QR code from {qr_image_path}: {str(e)}")
+            return None
+    
+    def validate_qr_code(self, qr_data, expected_type=None):
+        """
+        Validate QR code data
+        
+        Args:
+            qr_data: Decoded QR code data
+            expected_type: Expected QR code type
+            
+        Returns:
+            tuple: (is_valid, error_message)
+        """
+        try:
+            # Check if QR data is a dictionary
+            if not isinstance(qr_data, dict):
+                return False, "Invalid QR code format"
+            
+            # Check required fields
+            required_fields = ['type', 'generated_at']
+            for field in required_fields:
+                if field not in qr_data:
+                    return False, f"Missing required field: {field}"
+            
+            # Check QR code type if specified
+            if expected_type and qr_data.get('type') != expected_type:
+                return False, f"Invalid QR code type. Expected: {expected_type}, Got: {qr_data.get('type')}"
+            
+            # Check if QR code is expired (24 hours validity); compact
+            # payloads carry an integer epoch so the gate-scan hot path
+            # is a plain int compare instead of isoformat parsing
+            ts = qr_data.get('ts')
+            if ts is not None:
+                if time.time() - ts > 86400:
+                    return False, "QR code has expired"
+            else:
+                generated_at = datetime.fromisoformat(qr_data['generated_at'])
+                if datetime.now() - generated_at > timedelta(hours=24):
+                    return False, "QR code has expired"
+            
+            return True, "Valid QR code"
+            
+        except Exception as e:
+            logger.error(f"Failed to validate QR code: {str(e)}")
+            return False, f"Validation error: {str(e)}"
+
+# Global QR service instance
 qr_service = QRService()
\ No newline at end of file
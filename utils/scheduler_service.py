@@ -1,497 +1,645 @@
-"""
-Scheduler Service Module
-
-This module handles scheduled tasks:
-- Automated reminders
-- Daily/weekly reports
-- Data cleanup
-- System maintenance
-"""
-
-import os
-import logging
-from datetime import datetime, timedelta
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from flask import current_app
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class SchedulerService:
-    """Scheduler service class for handling scheduled tasks"""
-    
-    def __init__(self, app=None):
-        """Initialize the scheduler service"""
-        self.app = app
-        self.scheduler = None
-        if app:
-            self.init_app(app)
-    
-    def init_app(self, app):
-        """Initialize with Flask app"""
-        self.app = app
-        
-        # Create scheduler
-        self.scheduler = BackgroundScheduler(
-            timezone=app.config.get('SCHEDULER_TIMEZONE', 'UTC')
-        )
-        
-        # Register scheduled jobs
-        self._register_jobs()
-        
-        # Start scheduler
-        if app.config.get('SCHEDULER_API_ENABLED', True):
-            self.scheduler.start()
-            logger.info("Scheduler service started")
-    
-    def _register_jobs(self):
-        """Register all scheduled jobs"""
-        
-        # Daily event reminders (8:00 AM every day)
-        self.scheduler.add_job(
-            func=self.send_daily_event_reminders,
-            trigger=CronTrigger(hour=8, minute=0),
-            id='daily_event_reminders',
-            name='Daily Event Reminders',
-            replace_existing=True
-        )
-        
-        # Vendor reminders (9:00 AM every day)
-        self.scheduler.add_job(
-            func=self.send_vendor_reminders,
-            trigger=CronTrigger(hour=9, minute=0),
-            id='vendor_reminders',
-            name='Vendor Reminders',
-            replace_existing=True
-        )
-        
-        # Feedback requests (9:00 AM every day)
-        self.scheduler.add_job(
-            func=self.send_feedback_requests,
-            trigger=CronTrigger(hour=9, minute=30),
-            id='feedback_requests',
-            name='Feedback Requests',
-            replace_existing=True
-        )
-        
-        # Daily reports (6:00 PM every day)
-        self.scheduler.add_job(
-            func=self.generate_daily_reports,
-            trigger=CronTrigger(hour=18, minute=0),
-            id='daily_reports',
-            name='Daily Reports',
-            replace_existing=True
-        )
-        
-        # Weekly reports (Monday 8:00 AM)
-        self.scheduler.add_job(
-            func=self.generate_weekly_reports,
-            trigger=CronTrigger(day_of_week='mon', hour=8, minute=0),
-            id='weekly_reports',
-            name='Weekly Reports',
-            replace_existing=True
-        )
-        
-        # Data cleanup (2:00 AM every Sunday)
-        self.scheduler.add_job(
-            func=self.cleanup_old_data,
-            trigger=CronTrigger(day_of_week='sun', hour=2, minute=0),
-            id='data_cleanup',
-            name='Data Cleanup',
-            replace_existing=True
-        )
-        
-        # System health check (every hour)
-        self.scheduler.add_job(
-            func=self.system_health_check,
-            trigger=IntervalTrigger(hours=1),
-            id='health_check',
-            name='System Health Check',
-            replace_existing=True
-        )
-        
-        # Notification cleanup (every 6 hours)
-        self.scheduler.add_job(
-            func=self.cleanup_notifications,
-            trigger=IntervalTrigger(hours=6),
-            id='notification_cleanup',
-            name='Notification Cleanup',
-            replace_existing=True
-        )
-    
-    def send_daily_event_reminders(self):
-        """Send daily event reminders to guests"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Guest
-                
-                # Get events happening in the next 1-3 days
-                start_date = datetime.now() + timedelta(days=1)
-                end_date = datetime.now() + timedelta(days=3)
-                
-                upcoming_events = Event.query.filter(
-                    Event.start_date.between(start_date, end_date),
-                    Event.status.in_(['planned', 'ongoing'])
-                ).all()
-                
-                reminders_sent = 0
-                
-                for event in upcoming_events:
-                    for guest in event.guests:
-                        if guest.rsvp_status == 'confirmed' and not guest.check_in_status:
-                            # Send email reminder
-                            from utils.email_service import email_service
-                            email_service.send_event_reminder(guest, event, days_before=2)
-                            
-                            # Send SMS reminder if phone number available
-                            if guest.phone:
-                                from utils.sms_service import sms_service
-                                sms_service.send_event_reminder(guest, event, days_before=2)
-                            
-                            reminders_sent += 1
-                
-                logger.info(f"Sent {reminders_sent} daily event reminders")
-                
-        except Exception as e:
-            logger.error(f"Failed to send daily event reminders: {str(e)}")
-    
-    def send_vendor_reminders(self):
-        """Send reminders to vendors"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Vendor
-                
-                # Get events happening in the next 2-7 days
-                start_date = datetime.now() + timedelta(days=2)
-                end_date = datetime.now() + timedelta(days=7)
-                
-                upcoming_events = Event.query.filter(
-                    Event.start_date.between(start_date, end_date),
-                    Event.status.in_(['planned', 'ongoing'])
-                ).all()
-                
-                reminders_sent = 0
-                
-                for event in upcoming_events:
-                    for vendor in event.vendors:
-                        if vendor.payment_status != 'paid':
-                            # Send email reminder
-                            from utils.email_service import email_service
-                            email_service.send_vendor_welcome(vendor, event)
-                            
-                            # Send SMS reminder if phone number available
-                            if vendor.phone:
-                                from utils.sms_service import sms_service
-                                sms_service.send_vendor_reminder(vendor, event, days_before=3)
-                            
-                            reminders_sent += 1
-                
-                logger.info(f"Sent {reminders_sent} vendor reminders")
-                
-        except Exception as e:
-            logger.error(f"Failed to send vendor reminders: {str(e)}")
-    
-    def send_feedback_requests(self):
-        """Send feedback requests after completed events"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Guest
-                
-                # Get events completed in the last 1-2 days
-                end_date = datetime.now() - timedelta(days=1)
-                start_date = datetime.now() - timedelta(days=2)
-                
-                completed_events = Event.query.filter(
-                    Event.end_date.between(start_date, end_date),
-                    Event.status == 'completed'
-                ).all()
-                
-                feedback_requests_sent = 0
-                
-                for event in completed_events:
-                    for guest in event.guests:
-                        if guest.rsvp_status == 'confirmed':
-                            # Send feedback request email
-                            from utils.email_service import email_service
-                            email_service.send_feedback_request(guest, event)
-                            
-                            # Send SMS reminder if phone number available
-                            if guest.phone:
-                                from utils.sms_service import sms_service
-                                sms_service.send_event_update(
-                                    guest, event, 
-                                    "Thank you for attending! Please share your feedback."
-                                )
-                            
-                            feedback_requests_sent += 1
-                
-                logger.info(f"Sent {feedback_requests_sent} feedback requests")
-                
-        except Exception as e:
-            logger.error(f"Failed to send feedback requests: {str(e)}")
-    
-    def generate_daily_reports(self):
-        """Generate daily reports for administrators"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Guest, Payment, User
-                
-                # Get today's date range
-                today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                today_end = today_start + timedelta(days=1)
-                
-                # Get today's statistics
-                events_created = Event.query.filter(
-                    Event.created_at.between(today_start, today_end)
-                ).count()
-                
-                guests_registered = Guest.query.filter(
-                    Guest.created_at.between(today_start, today_end)
-                ).count()
-                
-                payments_processed = Payment.query.filter(
-                    Payment.created_at.between(today_start, today_end),
-                    Payment.status == 'completed'
-                ).count()
-                
-                total_revenue = db.session.query(
-                    db.func.sum(Payment.amount)
-                ).filter(
-                    Payment.created_at.between(today_start, today_end),
-                    Payment.status == 'completed'
-                ).scalar() or 0
-                
-                # Get admin users
-                admin_users = User.query.filter_by(role='admin').all()
-                
-                # Send daily report to admins
-                from utils.email_service import email_service
-                
-                for admin in admin_users:
-                    if admin.email:
-                        report_data = {
-                            'date': today_start.strftime('%Y-%m-%d'),
-                            'events_created': events_created,
-                            'guests_registered': guests_registered,
-                            'payments_processed': payments_processed,
-                            'total_revenue': total_revenue
-                        }
-                        
-                        # Send daily report email
-                        subject = f"Daily Report - {today_start.strftime('%Y-%m-%d')}"
-                        email_service.send_email(
-                            admin.email,
-                            subject,
-                            'daily_report',
-                            report_data
-                        )
-                
-                logger.info(f"Generated daily reports for {len(admin_users)} admins")
-                
-        except Exception as e:
-            logger.error(f"Failed to generate daily reports: {str(e)}")
-    
-    def generate_weekly_reports(self):
-        """Generate weekly reports for administrators"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Guest, Payment, User
-                
-                # Get last week's date range
-                today = datetime.now()
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=7)
-                
-                # Get weekly statistics
-                events_created = Event.query.filter(
-                    Event.created_at.between(week_start, week_end)
-                ).count()
-                
-                guests_registered = Guest.query.filter(
-                    Guest.created_at.between(week_start, week_end)
-                ).count()
-                
-                payments_processed = Payment.query.filter(
-                    Payment.created_at.between(week_start, week_end),
-                    Payment.status == 'completed'
-                ).count()
-                
-                total_revenue = db.session.query(
-                    db.func.sum(Payment.amount)
-                ).filter(
-                    Payment.created_at.between(week_start, week_end),
-                    Payment.status == 'completed'
-                ).scalar() or 0
-                
-                # Get admin users
-                admin_users = User.query.filter_by(role='admin').all()
-                
-                # Send weekly report to admins
-                from utils.email_service import email_service
-                
-                for admin in admin_users:
-                    if admin.email:
-                        report_data = {
-                            'week_start': week_start.strftime('%Y-%m-%d'),
-                            'week_end': week_end.strftime('%Y-%m-%d'),
-                            'events_created': events_created,
-                            'guests_registered': guests_registered,
-                            'payments_processed': payments_processed,
-                            'total_revenue': total_revenue
-                        }
-                        
-                        # Send weekly report email
-                        subject = f"Weekly Report - {week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')}"
-                        email_service.send_email(
-                            admin.email,
-                            subject,
-                            'weekly_report',
-                            report_data
-                        )
-                
-                logger.info(f"Generated weekly reports for {len(admin_users)} admins")
-                
-        except Exception as e:
-            logger.error(f"Failed to generate weekly reports: {str(e)}")
-    
-    def cleanup_old_data(self):
-        """Clean up old data"""
-        try:
-            with self.app.app_context():
-                from app import db, Feedback
-                
-                # Delete feedback older than 1 year
-                cutoff_date = datetime.now() - timedelta(days=365)
-                
-                deleted_feedback = Feedback.query.filter(
-                    Feedback.created_at < cutoff_date
-                ).delete()
-                
-                db.session.commit()
-                
-                logger.info(f"Cleaned up {deleted_feedback} old feedback records")
-                
-        except Exception as e:
-            logger.error(f"Failed to cleanup old data: {str(e)}")
-    
-    def system_health_check(self):
-        """Perform system health check"""
-        try:
-            with self.app.app_context():
-                from app import db, Event, Guest, Payment, User
-                
-                # Check database connectivity
-                try:
-                    db.session.execute('SELECT 1')
-                    db_status = "healthy"
-                except:
-                    db_status = "unhealthy"
-                
-                # Get system statistics
-                total_users = User.query.count()
-                total_events = Event.query.count()
-                total_guests = Guest.query.count()
-                total_payments = Payment.query.count()
-                
-                health_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'database_status': db_status,
-                    'total_users': total_users,
-                    'total_events': total_events,
-                    'total_guests': total_guests,
-                    'total_payments': total_payments,
-                    'scheduler_jobs': len(self.scheduler.get_jobs())
-                }
-                
-                logger.info(f"System health check: {health_data}")
-                
-                # Send alert if system is unhealthy
-                if db_status == "unhealthy":
-                    from utils.email_service import email_service
-                    admin_users = User.query.filter_by(role='admin').all()
-                    
-                    for admin in admin_users:
-                        if admin.email:
-                            email_service.send_email(
-                                admin.email,
-                                "System Health Alert",
-                                'system_alert',
-                                health_data
-                            )
-                
-        except Exception as e:
-            logger.error(f"Failed to perform system health check: {str(e)}")
-    
-    def cleanup_notifications(self):
-        """Clean up old notifications"""
-        try:
-            with self.app.app_context():
-                from utils.notification_service import notification_service
-                
-                # Clean up notifications older than 30 days
-                cleaned_count = notification_service.cleanup_old_notifications(days=30)
-                
-                logger.info(f"Cleaned up {cleaned_count} old notifications")
-                
-        except Exception as e:
-            logger.error(f"Failed to cleanup notifications: {str(e)}")
-    
-    def get_scheduler_status(self):
-        """Get scheduler status"""
-        try:
-            if not self.scheduler:
-                return {'status': 'not_initialized'}
-            
-            return {
-                'status': 'running' if self.scheduler.running else 'stopped',
-                'jobs': len(self.scheduler.get_jobs()),
-                'next_run_time': self.scheduler.get_jobs()[0].next_run_time.isoformat() if self.scheduler.get_jobs() else None
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to get scheduler status: {str(e)}")
-            return {'status': 'error', 'error': str(e)}
-    
-    def add_job(self, func, trigger, job_id, name, **kwargs):
-        """Add a custom job to the scheduler"""
-        try:
-            self.scheduler.add_job(
-                func=func,
-                trigger=trigger,
-                id=job_id,
-                name=name,
-                replace_existing=True,
-                **kwargs
-            )
-            logger.info(f"Added custom job: {name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to add custom job {name}: {str(e)}")
-            return False
-    
-    def remove_job(self, job_id):
-        """Remove a job from the scheduler"""
-        try:
-            self.scheduler.remove_job(job_id)
-            logger.info(f"Removed job: {job_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to remove job {job_id}: {str(e)}")
-            return False
-    
-    def shutdown(self):
-        """Shutdown the scheduler"""
-        try:
-            if self.scheduler and self.scheduler.running:
-                self.scheduler.shutdown()
-                logger.info("Scheduler service shutdown")
-        except Exception as e:
-            logger.error(f"Failed to shutdown scheduler: {str(e)}")
-
-# Global scheduler service instance
+"""
+Scheduler Service Module
+
+This module handles scheduled tasks:
+- Automated reminders
+- Daily/weekly reports
+- Data cleanup
+- System maintenance
+"""
+
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from functools import wraps
+from apscheduler.executors.pool import ThreadPoolExecutor
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from flask import current_app
+from utils.email_service import email_service
+from utils.sms_service import sms_service
+from utils.task_queue import task_queue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How long the cached admin recipient list stays fresh (seconds); admins
+# change rarely, report/alert jobs query for them often
+ADMIN_CACHE_TTL = 600
+
+# How many recipients each queued reminder task handles; bounds both
+# task runtime and the size of the id list carried in the queue
+REMINDER_CHUNK_SIZE = 500
+
+# How long the health check reuses its table totals (seconds); the
+# counts are informational and full-table COUNT(*) is the expensive part
+# of an otherwise cheap probe
+HEALTH_STATS_TTL = 6 * 3600
+
+class SchedulerService:
+    """Scheduler service class for handling scheduled tasks"""
+    
+    def __init__(self, app=None):
+        """Initialize the scheduler service"""
+        self.app = app
+        self.scheduler = None
+        self._admin_emails = None
+        self._admin_emails_at = 0.0
+        self._stats_cache = {}
+        self._health_stats = None
+        self._health_stats_at = 0.0
+        self._lock_file = None
+        if app:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Initialize with Flask app"""
+        self.app = app
+        
+        # Create scheduler with an explicitly sized thread pool (the
+        # APScheduler default is 10) and defaults that keep a slow bulk job
+        # from stacking up: missed runs within the grace window coalesce
+        # into one, and a job never runs concurrently with itself
+        self.scheduler = BackgroundScheduler(
+            timezone=app.config.get('SCHEDULER_TIMEZONE', 'UTC'),
+            executors={
+                'default': ThreadPoolExecutor(
+                    max_workers=app.config.get('SCHEDULER_MAX_WORKERS', 20)
+                )
+            },
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': 300
+            }
+        )
+        
+        # Register scheduled jobs
+        self._register_jobs()
+        
+        # Start scheduler in exactly one process: under a multi-worker
+        # server every worker imports the app, and without this gate each
+        # one would run its own scheduler and send every reminder N times
+        if app.config.get('SCHEDULER_API_ENABLED', True) and self._acquire_leadership():
+            self.scheduler.start()
+            logger.info("Scheduler service started")
+    
+    def _acquire_leadership(self):
+        """Elect a single process on this host to run the scheduler
+        
+        Takes a non-blocking exclusive lock on a well-known file and
+        holds it for the process lifetime; the OS releases it if the
+        process dies, letting another worker take over on restart. Under
+        the Flask debug reloader only the reloaded child qualifies.
+        
+        Returns:
+            bool: True if this process should start the scheduler
+        """
+        if self.app.debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+            return False
+        
+        if not FCNTL_AVAILABLE:
+            # No flock on this platform; assume a single-process server
+            return True
+        
+        lock_path = self.app.config.get('SCHEDULER_LOCK_FILE', 'scheduler.lock')
+        try:
+            self._lock_file = open(lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+            logger.info("Another worker holds the scheduler lock; jobs will not run here")
+            return False
+    
+    def _wrapped_job(self, func):
+        """Wrap a job so every run ends with a clean database session
+        
+        APScheduler runs jobs on long-lived pool threads; without an
+        explicit remove() each thread keeps its scoped session — and
+        whatever identity-map rows the job loaded — alive until the next
+        run on that thread.
+        """
+        @wraps(func)
+        def runner():
+            with self.app.app_context():
+                from app import db
+                try:
+                    return func()
+                finally:
+                    db.session.remove()
+        return runner
+    
+    def _register_jobs(self):
+        """Register all scheduled jobs"""
+        
+        # Morning notifications (8:00 AM every day): guest reminders,
+        # vendor reminders and feedback requests run back to back under
+        # one trigger instead of three staggered cron entries
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.send_morning_notifications),
+            trigger=CronTrigger(hour=8, minute=0),
+            id='morning_notifications',
+            name='Morning Notifications',
+            replace_existing=True
+        )
+        
+        # Daily reports (6:00 PM every day)
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.generate_daily_reports),
+            trigger=CronTrigger(hour=18, minute=0),
+            id='daily_reports',
+            name='Daily Reports',
+            replace_existing=True
+        )
+        
+        # Weekly reports (Monday 8:00 AM)
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.generate_weekly_reports),
+            trigger=CronTrigger(day_of_week='mon', hour=8, minute=0),
+            id='weekly_reports',
+            name='Weekly Reports',
+            replace_existing=True
+        )
+        
+        # Data cleanup (2:00 AM every Sunday)
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.cleanup_old_data),
+            trigger=CronTrigger(day_of_week='sun', hour=2, minute=0),
+            id='data_cleanup',
+            name='Data Cleanup',
+            replace_existing=True
+        )
+        
+        # System health check (every hour)
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.system_health_check),
+            trigger=IntervalTrigger(hours=1),
+            id='health_check',
+            name='System Health Check',
+            replace_existing=True
+        )
+        
+        # Notification cleanup (every 6 hours)
+        self.scheduler.add_job(
+            func=self._wrapped_job(self.cleanup_notifications),
+            trigger=IntervalTrigger(hours=6),
+            id='notification_cleanup',
+            name='Notification Cleanup',
+            replace_existing=True
+        )
+    
+    def send_morning_notifications(self):
+        """Run all morning notification passes back to back
+        
+        Consolidates the guest-reminder, vendor-reminder and
+        feedback-request jobs into a single scheduled run: one scheduler
+        slot, one warm session and connection for all three passes, and
+        no risk of the passes overlapping each other. Each pass keeps its
+        own error handling, so a failure in one does not stop the rest.
+        """
+        self.send_daily_event_reminders()
+        self.send_vendor_reminders()
+        self.send_feedback_requests()
+    
+    def send_daily_event_reminders(self):
+        """Queue daily event reminders to guests"""
+        try:
+            with self.app.app_context():
+                from app import db, Event, Guest
+                
+                # Get events happening in the next 1-3 days
+                start_date = datetime.now() + timedelta(days=1)
+                end_date = datetime.now() + timedelta(days=3)
+                
+                # Fetch only the ids here; the actual sending happens on
+                # task-queue workers so the scheduler tick finishes in
+                # milliseconds instead of blocking for the whole send run
+                guest_ids = [row[0] for row in db.session.query(Guest.id).join(
+                    Event, Guest.event_id == Event.id
+                ).filter(
+                    Event.start_date.between(start_date, end_date),
+                    Event.status.in_(['planned', 'ongoing']),
+                    Guest.rsvp_status == 'confirmed',
+                    Guest.check_in_status == False
+                ).all()]
+                
+                for offset in range(0, len(guest_ids), REMINDER_CHUNK_SIZE):
+                    task_queue.enqueue(
+                        self._send_guest_reminder_chunk,
+                        guest_ids[offset:offset + REMINDER_CHUNK_SIZE],
+                        2
+                    )
+                
+                logger.info(f"Queued {len(guest_ids)} daily event reminders")
+                
+        except Exception as e:
+            logger.error(f"Failed to send daily event reminders: {str(e)}")
+    
+    def _send_guest_reminder_chunk(self, guest_ids, days_before):
+        """Send reminders for one chunk of guest ids on a queue worker"""
+        with self.app.app_context():
+            from app import db, Event, Guest
+            
+            chunk = db.session.query(Guest, Event).join(
+                Event, Guest.event_id == Event.id
+            ).filter(Guest.id.in_(guest_ids)).all()
+            
+            for guest, event in chunk:
+                # Send email reminder
+                email_service.send_event_reminder(guest, event, days_before=days_before)
+                
+                # Send SMS reminder if phone number available
+                if guest.phone:
+                    sms_service.send_event_reminder(guest, event, days_before=days_before)
+    
+    def send_vendor_reminders(self):
+        """Queue reminders to vendors"""
+        try:
+            with self.app.app_context():
+                from app import db, Event, Vendor
+                
+                # Get events happening in the next 2-7 days
+                start_date = datetime.now() + timedelta(days=2)
+                end_date = datetime.now() + timedelta(days=7)
+                
+                # Fetch only the ids; sending happens on queue workers
+                vendor_ids = [row[0] for row in db.session.query(Vendor.id).join(
+                    Event, Vendor.event_id == Event.id
+                ).filter(
+                    Event.start_date.between(start_date, end_date),
+                    Event.status.in_(['planned', 'ongoing']),
+                    Vendor.payment_status != 'paid'
+                ).all()]
+                
+                for offset in range(0, len(vendor_ids), REMINDER_CHUNK_SIZE):
+                    task_queue.enqueue(
+                        self._send_vendor_reminder_chunk,
+                        vendor_ids[offset:offset + REMINDER_CHUNK_SIZE],
+                        3
+                    )
+                
+                logger.info(f"Queued {len(vendor_ids)} vendor reminders")
+                
+        except Exception as e:
+            logger.error(f"Failed to send vendor reminders: {str(e)}")
+    
+    def _send_vendor_reminder_chunk(self, vendor_ids, days_before):
+        """Send reminders for one chunk of vendor ids on a queue worker"""
+        with self.app.app_context():
+            from app import db, Event, Vendor
+            
+            chunk = db.session.query(Vendor, Event).join(
+                Event, Vendor.event_id == Event.id
+            ).filter(Vendor.id.in_(vendor_ids)).all()
+            
+            for vendor, event in chunk:
+                # Send email reminder
+                email_service.send_vendor_welcome(vendor, event)
+                
+                # Send SMS reminder if phone number available
+                if vendor.phone:
+                    sms_service.send_vendor_reminder(vendor, event, days_before=days_before)
+    
+    def send_feedback_requests(self):
+        """Queue feedback requests after completed events"""
+        try:
+            with self.app.app_context():
+                from app import db, Event, Guest
+                
+                # Get events completed in the last 1-2 days
+                end_date = datetime.now() - timedelta(days=1)
+                start_date = datetime.now() - timedelta(days=2)
+                
+                # Fetch only the ids; sending happens on queue workers
+                guest_ids = [row[0] for row in db.session.query(Guest.id).join(
+                    Event, Guest.event_id == Event.id
+                ).filter(
+                    Event.end_date.between(start_date, end_date),
+                    Event.status == 'completed',
+                    Guest.rsvp_status == 'confirmed'
+                ).all()]
+                
+                for offset in range(0, len(guest_ids), REMINDER_CHUNK_SIZE):
+                    task_queue.enqueue(
+                        self._send_feedback_request_chunk,
+                        guest_ids[offset:offset + REMINDER_CHUNK_SIZE]
+                    )
+                
+                logger.info(f"Queued {len(guest_ids)} feedback requests")
+                
+        except Exception as e:
+            logger.error(f"Failed to send feedback requests: {str(e)}")
+    
+    def _send_feedback_request_chunk(self, guest_ids):
+        """Send feedback requests for one chunk of guest ids on a queue worker"""
+        with self.app.app_context():
+            from app import db, Event, Guest
+            
+            chunk = db.session.query(Guest, Event).join(
+                Event, Guest.event_id == Event.id
+            ).filter(Guest.id.in_(guest_ids)).all()
+            
+            for guest, event in chunk:
+                # Send feedback request email
+                email_service.send_feedback_request(guest, event)
+                
+                # Send SMS reminder if phone number available
+                if guest.phone:
+                    sms_service.send_event_update(
+                        guest, event, 
+                        "Thank you for attending! Please share your feedback."
+                    )
+    
+    def _get_admin_emails(self):
+        """Return admin email addresses, cached briefly
+        
+        Every report and alert job ran the same User query for the admin
+        list; a short TTL cache removes the repeated lookups without
+        holding a stale list for long.
+        """
+        now = time.time()
+        if self._admin_emails is None or now - self._admin_emails_at > ADMIN_CACHE_TTL:
+            from app import User
+            self._admin_emails = [
+                admin.email
+                for admin in User.query.filter_by(role='admin').all()
+                if admin.email
+            ]
+            self._admin_emails_at = now
+        return self._admin_emails
+    
+    def _collect_stats(self, start, end):
+        """Compute creation and payment aggregates for a date range
+        
+        Ranges that lie fully in the past are immutable, so their results
+        are memoized and reused across report jobs instead of re-running
+        the aggregate queries.
+        
+        Args:
+            start (datetime): Range start (inclusive)
+            end (datetime): Range end
+            
+        Returns:
+            dict: events_created, guests_registered, payments_processed
+                and total_revenue for the range
+        """
+        from app import db, Event, Guest, Payment
+        
+        immutable = end <= datetime.now()
+        if immutable:
+            cached = self._stats_cache.get((start, end))
+            if cached is not None:
+                return cached
+        
+        # One query grouped by calendar day yields the range totals and
+        # the per-day breakdown together, instead of one round-trip per
+        # day (func.date works on SQLite and PostgreSQL alike)
+        day = db.func.date(Payment.created_at)
+        payment_rows = db.session.query(
+            day.label('day'),
+            db.func.count(Payment.id),
+            db.func.coalesce(db.func.sum(Payment.amount), 0)
+        ).filter(
+            Payment.created_at.between(start, end),
+            Payment.status == 'completed'
+        ).group_by('day').order_by('day').all()
+        
+        daily_payments = {
+            str(day_value): {'payments_processed': count, 'total_revenue': revenue}
+            for day_value, count, revenue in payment_rows
+        }
+        
+        stats = {
+            'events_created': Event.query.filter(
+                Event.created_at.between(start, end)
+            ).count(),
+            'guests_registered': Guest.query.filter(
+                Guest.created_at.between(start, end)
+            ).count(),
+            'payments_processed': sum(count for _, count, _revenue in payment_rows),
+            'total_revenue': sum(revenue for _, _count, revenue in payment_rows),
+            'daily_payments': daily_payments
+        }
+        
+        if immutable:
+            self._stats_cache[(start, end)] = stats
+        return stats
+    
+    def generate_daily_reports(self):
+        """Generate daily reports for administrators"""
+        try:
+            with self.app.app_context():
+                # Get today's date range
+                today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                today_end = today_start + timedelta(days=1)
+                
+                # Get today's statistics
+                report_data = {
+                    'date': today_start.strftime('%Y-%m-%d'),
+                    **self._collect_stats(today_start, today_end)
+                }
+                
+                # Send one BCC'd daily report to all admins
+                admin_emails = self._get_admin_emails()
+                subject = f"Daily Report - {today_start.strftime('%Y-%m-%d')}"
+                email_service.send_bulk_same(admin_emails, subject, 'daily_report', report_data)
+                
+                logger.info(f"Generated daily reports for {len(admin_emails)} admins")
+                
+        except Exception as e:
+            logger.error(f"Failed to generate daily reports: {str(e)}")
+    
+    def generate_weekly_reports(self):
+        """Generate weekly reports for administrators"""
+        try:
+            with self.app.app_context():
+                # Get last week's date range
+                today = datetime.now()
+                week_start = today - timedelta(days=today.weekday())
+                week_end = week_start + timedelta(days=7)
+                
+                # Get weekly statistics
+                report_data = {
+                    'week_start': week_start.strftime('%Y-%m-%d'),
+                    'week_end': week_end.strftime('%Y-%m-%d'),
+                    **self._collect_stats(week_start, week_end)
+                }
+                
+                # Send one BCC'd weekly report to all admins
+                admin_emails = self._get_admin_emails()
+                subject = f"Weekly Report - {week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')}"
+                email_service.send_bulk_same(admin_emails, subject, 'weekly_report', report_data)
+                
+                logger.info(f"Generated weekly reports for {len(admin_emails)} admins")
+                
+        except Exception as e:
+            logger.error(f"Failed to generate weekly reports: {str(e)}")
+    
+    def cleanup_old_data(self):
+        """Clean up old data"""
+        try:
+            with self.app.app_context():
+                from app import db, Feedback
+                
+                # Delete feedback older than 1 year, in bounded batches:
+                # one giant DELETE holds row locks and bloats the
+                # transaction for the whole run, while per-batch commits
+                # keep each transaction short
+                cutoff_date = datetime.now() - timedelta(days=365)
+                batch_size = 5000
+                deleted_feedback = 0
+                
+                while True:
+                    batch_ids = [
+                        row[0] for row in Feedback.query.with_entities(Feedback.id).filter(
+                            Feedback.created_at < cutoff_date
+                        ).limit(batch_size).all()
+                    ]
+                    
+                    if not batch_ids:
+                        break
+                    
+                    Feedback.query.filter(
+                        Feedback.id.in_(batch_ids)
+                    ).delete(synchronize_session=False)
+                    db.session.commit()
+                    
+                    deleted_feedback += len(batch_ids)
+                    logger.info(f"Feedback cleanup progress: {deleted_feedback} records deleted")
+                
+                logger.info(f"Cleaned up {deleted_feedback} old feedback records")
+                
+        except Exception as e:
+            logger.error(f"Failed to cleanup old data: {str(e)}")
+    
+    def system_health_check(self):
+        """Perform system health check"""
+        try:
+            with self.app.app_context():
+                from app import db, Event, Guest, Payment, User
+                
+                # Check database connectivity with a driver-level probe on
+                # a dedicated connection: no ORM session, no statement
+                # compilation, just one round-trip
+                try:
+                    with db.engine.connect() as conn:
+                        conn.exec_driver_sql('SELECT 1')
+                    db_status = "healthy"
+                except Exception:
+                    db_status = "unhealthy"
+                
+                # Table totals are informational only, so refresh them on a
+                # long TTL instead of running four COUNT(*) scans every hour
+                now = time.time()
+                if self._health_stats is None or now - self._health_stats_at > HEALTH_STATS_TTL:
+                    self._health_stats = {
+                        'total_users': User.query.count(),
+                        'total_events': Event.query.count(),
+                        'total_guests': Guest.query.count(),
+                        'total_payments': Payment.query.count()
+                    }
+                    self._health_stats_at = now
+                
+                health_data = {
+                    'timestamp': datetime.now().isoformat(),
+                    'database_status': db_status,
+                    'scheduler_jobs': len(self.scheduler.get_jobs()),
+                    **self._health_stats
+                }
+                
+                logger.info(f"System health check: {health_data}")
+                
+                # Send alert if system is unhealthy
+                if db_status == "unhealthy":
+                    for admin_email in self._get_admin_emails():
+                        email_service.send_email(
+                            admin_email,
+                            "System Health Alert",
+                            'system_alert',
+                            health_data
+                        )
+                
+        except Exception as e:
+            logger.error(f"Failed to perform system health check: {str(e)}")
+    
+    def cleanup_notifications(self):
+        """Clean up old notifications"""
+        try:
+            with self.app.app_context():
+                from utils.notification_service import notification_service
+                
+                # Clean up notifications older than 30 days
+                cleaned_count = notification_service.cleanup_old_notifications(days=30)
+                
+                logger.info(f"Cleaned up {cleaned_count} old notifications")
+                
+        except Exception as e:
+            logger.error(f"Failed to cleanup notifications: {str(e)}")
+    
+    def get_scheduler_status(self):
+        """Get scheduler status"""
+        try:
+            if not self.scheduler:
+                return {'status': 'not_initialized'}
+            
+            return {
+                'status': 'running' if self.scheduler.running else 'stopped',
+                'jobs': len(self.scheduler.get_jobs()),
+                'next_run_time': self.scheduler.get_jobs()[0].next_run_time.isoformat() if self.scheduler.get_jobs() else None
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get scheduler status: {str(e)}")
+            return {'status': 'error', 'error': str(e)}
+    
+    def add_job(self, func, trigger, job_id, name, **kwargs):
+        """Add a custom job to the scheduler"""
+        try:
+            self.scheduler.add_job(
+                func=func,
+                trigger=trigger,
+                id=job_id,
+                name=name,
+                replace_existing=True,
+                **kwargs
+            )
+            logger.info(f"Added custom job: {name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to add custom job {name}: {str(e)}")
+            return False
+    
+    def remove_job(self, job_id):
+        """Remove a job from the scheduler"""
+        try:
+            self.scheduler.remove_job(job_id)
+            logger.info(f"Removed job: {job_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to remove job {job_id}: {str(e)}")
+            return False
+    
+    def shutdown(self):
+        """Shutdown the scheduler"""
+        try:
+            if self.scheduler and self.scheduler.running:
+                self.scheduler.shutdown()
+                logger.info("Scheduler service shutdown")
+        except Exception as e:
+            logger.error(f"Failed to shutdown scheduler: {str(e)}")
+
+# Global scheduler service instance
 scheduler_service = SchedulerService()
\ No newline at end of file
@@ -1,246 +1,474 @@
-"""
-SMS Service Module
-
-This module handles all SMS-related functionality using Twilio:
-- Event reminders
-- RSVP confirmations
-- Check-in notifications
-- Urgent updates
-"""
-
-import os
-import logging
-from datetime import datetime, timedelta
-from flask import current_app
-
-try:
-    from twilio.rest import Client
-    TWILIO_AVAILABLE = True
-except ImportError:
-    TWILIO_AVAILABLE = False
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class SMSService:
-    """SMS service class for handling all SMS communications"""
-    
-    def __init__(self, app=None):
-        """Initialize the SMS service"""
-        self.app = app
-        self.client = None
-        if app:
-            self.init_app(app)
-    
-    def init_app(self, app):
-        """Initialize with Flask app"""
-        self.app = app
-        
-        # Initialize Twilio client if credentials are available
-        if TWILIO_AVAILABLE and self._check_twilio_credentials():
-            account_sid = app.config.get('TWILIO_ACCOUNT_SID')
-            auth_token = app.config.get('TWILIO_AUTH_TOKEN')
-            self.client = Client(account_sid, auth_token)
-        else:
-            logger.warning("Twilio credentials not configured. SMS functionality will be simulated.")
-    
-    def _check_twilio_credentials(self):
-        """Check if Twilio credentials are configured"""
-        required_creds = ['TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN', 'TWILIO_PHONE_NUMBER']
-        return all(self.app.config.get(cred) for cred in required_creds)
-    
-    def send_sms(self, to, message):
-        """
-        Send SMS message
-        
-        Args:
-            to (str): Recipient phone number (E.164 format)
-            message (str): SMS message content
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
-        try:
-            if not self.client:
-                # Simulate SMS sending for development/testing
-                logger.info(f"[SMS SIMULATION] To: {to}, Message: {message}")
-                return True
-            
-            # Send actual SMS via Twilio
-            message_obj = self.client.messages.create(
-                body=message,
-                from_=self.app.config.get('TWILIO_PHONE_NUMBER'),
-                to=to
-            )
-            
-            logger.info(f"SMS sent successfully to {to}. SID: {message_obj.sid}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send SMS to {to}: {str(e)}")
-            return False
-    
-    def send_event_reminder(self, guest, event, days_before=1):
-        """Send event reminder SMS to guest"""
-        message = (
-            f"REMINDER: {event.title} is in {days_before} day{'s' if days_before > 1 else ''}! "
-            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
-            f"Venue: {event.venue}. "
-            f"Ticket: {guest.ticket_number}. "
-            f"We look forward to seeing you!"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def send_rsvp_confirmation(self, guest, event, status):
-        """Send RSVP confirmation SMS to guest"""
-        status_text = "confirmed" if status == "confirmed" else "declined"
-        message = (
-            f"RSVP {status_text.upper()} for {event.title}. "
-            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}. "
-            f"Ticket: {guest.ticket_number}. "
-            f"{'See you there!' if status == 'confirmed' else 'Thank you for letting us know.'}"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def send_check_in_notification(self, guest, event):
-        """Send check-in confirmation SMS to guest"""
-        message = (
-            f"Checked in successfully! Welcome to {event.title}. "
-            f"Enjoy the event! "
-            f"Ticket: {guest.ticket_number}"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def send_event_update(self, guest, event, update_message):
-        """Send event update SMS to guest"""
-        message = (
-            f"UPDATE for {event.title}: {update_message} "
-            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}. "
-            f"Ticket: {guest.ticket_number}"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def send_vendor_reminder(self, vendor, event, days_before=2):
-        """Send reminder SMS to vendor"""
-        message = (
-            f"REMINDER: Your {vendor.service_type} services for {event.title} "
-            f"are needed in {days_before} day{'s' if days_before > 1 else ''}. "
-            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
-            f"Venue: {event.venue}. "
-            f"Contact organizer for questions."
-        )
-        
-        return self.send_sms(vendor.phone, message)
-    
-    def send_payment_confirmation(self, user_phone, amount, event_title):
-        """Send payment confirmation SMS"""
-        message = (
-            f"PAYMENT CONFIRMED: ${amount:.2f} received for {event_title}. "
-            f"Thank you for your payment!"
-        )
-        
-        return self.send_sms(user_phone, message)
-    
-    def send_emergency_notification(self, guest, event, emergency_message):
-        """Send emergency notification SMS to guest"""
-        message = (
-            f"URGENT: {event.title} - {emergency_message} "
-            f"Please check your email for more information. "
-            f"Ticket: {guest.ticket_number}"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def send_welcome_message(self, guest, event):
-        """Send welcome SMS to newly registered guest"""
-        message = (
-            f"Welcome! You're registered for {event.title}. "
-            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
-            f"Venue: {event.venue}. "
-            f"Ticket: {guest.ticket_number}. "
-            f"Check your email for details!"
-        )
-        
-        return self.send_sms(guest.phone, message)
-    
-    def bulk_send_event_reminders(self, guests, event, days_before=1):
-        """Send bulk event reminders to all guests"""
-        success_count = 0
-        total_count = 0
-        
-        for guest in guests:
-            if guest.phone:  # Only send to guests with phone numbers
-                total_count += 1
-                if self.send_event_reminder(guest, event, days_before):
-                    success_count += 1
-        
-        logger.info(f"Bulk SMS reminders sent: {success_count}/{total_count} successful")
-        return {
-            'total': total_count,
-            'successful': success_count,
-            'failed': total_count - success_count
-        }
-    
-    def bulk_send_vendor_reminders(self, vendors, event, days_before=2):
-        """Send bulk reminders to all vendors"""
-        success_count = 0
-        total_count = 0
-        
-        for vendor in vendors:
-            if vendor.phone:  # Only send to vendors with phone numbers
-                total_count += 1
-                if self.send_vendor_reminder(vendor, event, days_before):
-                    success_count += 1
-        
-        logger.info(f"Bulk vendor reminders sent: {success_count}/{total_count} successful")
-        return {
-            'total': total_count,
-            'successful': success_count,
-            'failed': total_count - success_count
-        }
-    
-    def get_sms_status(self, message_sid):
-        """Get status of a sent SMS message"""
-        try:
-            if not self.client:
-                return {'status': 'simulated', 'error': 'Twilio not configured'}
-            
-            message = self.client.messages(message_sid).fetch()
-            return {
-                'status': message.status,
-                'date_created': message.date_created,
-                'date_sent': message.date_sent,
-                'error_code': message.error_code,
-                'error_message': message.error_message
-            }
-        except Exception as e:
-            logger.error(f"Failed to get SMS status for {message_sid}: {str(e)}")
-            return {'status': 'error', 'error': str(e)}
-    
-    def validate_phone_number(self, phone_number):
-        """Validate and format phone number"""
-        try:
-            if not self.client:
-                # Basic validation for simulation
-                phone_number = phone_number.strip()
-                if phone_number.startswith('+'):
-                    return phone_number
-                elif phone_number.startswith('0'):
-                    return f'+265{phone_number[1:]}'  # Malawi country code
-                else:
-                    return f'+265{phone_number}'
-            
-            # Use Twilio lookup for proper validation
-            phone_number = self.client.lookups.v2.phone_numbers(phone_number).fetch()
-            return phone_number.phone_number
-        except Exception as e:
-            logger.error(f"Phone number validation failed for {phone_number}: {str(e)}")
-            return None
-
-# Global SMS service instance
+"""
+SMS Service Module
+
+This module handles all SMS-related functionality using Twilio:
+- Event reminders
+- RSVP confirmations
+- Check-in notifications
+- Urgent updates
+"""
+
+import os
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from flask import current_app
+
+try:
+    from twilio.rest import Client
+    from twilio.http.http_client import TwilioHttpClient
+    TWILIO_AVAILABLE = True
+except ImportError:
+    TWILIO_AVAILABLE = False
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _best_phone(contact):
+    """Prefer the E.164 number stored at registration over the raw one
+
+    Normalization (including the billed Twilio lookup) is paid once when
+    the guest or vendor is created, so the send path never re-validates.
+    """
+    return getattr(contact, 'phone_e164', None) or contact.phone
+
+class SMSService:
+    """SMS service class for handling all SMS communications"""
+    
+    def __init__(self, app=None):
+        """Initialize the SMS service"""
+        self.app = app
+        self.client = None
+        self.session = None
+        if app:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Initialize with Flask app"""
+        self.app = app
+        
+        # Initialize Twilio client if credentials are available
+        if TWILIO_AVAILABLE and self._check_twilio_credentials():
+            account_sid = app.config.get('TWILIO_ACCOUNT_SID')
+            auth_token = app.config.get('TWILIO_AUTH_TOKEN')
+            
+            # One pooled HTTPS session for all Twilio calls: connections
+            # are reused across sends instead of paying a TLS handshake
+            # each time, and transient errors retry with backoff
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=50,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.2,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=None
+                )
+            )
+            self.session.mount('https://', adapter)
+            
+            http_client = TwilioHttpClient(timeout=10)
+            http_client.session = self.session
+            
+            self.client = Client(account_sid, auth_token, http_client=http_client)
+        else:
+            logger.warning("Twilio credentials not configured. SMS functionality will be simulated.")
+    
+    def _check_twilio_credentials(self):
+        """Check if Twilio credentials are configured"""
+        required_creds = ['TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN', 'TWILIO_PHONE_NUMBER']
+        return all(self.app.config.get(cred) for cred in required_creds)
+    
+    def send_sms(self, to, message):
+        """
+        Send SMS message
+        
+        Args:
+            to (str): Recipient phone number (E.164 format)
+            message (str): SMS message content
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        try:
+            if not self.client:
+                # Simulate SMS sending for development/testing
+                logger.info(f"[SMS SIMULATION] To: {to}, Message: {message}")
+                return True
+            
+            # Send actual SMS via Twilio
+            message_obj = self.client.messages.create(
+                body=message,
+                from_=self.app.config.get('TWILIO_PHONE_NUMBER'),
+                to=to
+            )
+            
+            logger.info(f"SMS sent successfully to {to}. SID: {message_obj.sid}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to send SMS to {to}: {str(e)}")
+            return False
+    
+    def _log_sends(self, event, phones, results):
+        """Persist send-audit rows for a bulk run in batches
+        
+        One bulk_insert_mappings per 1000-row batch instead of an ORM
+        INSERT and commit per message.
+        
+        Args:
+            event: Event the messages relate to
+            phones (list): Recipient phone numbers
+            results (list): Per-message success flags, aligned to phones
+        """
+        try:
+            from app import db, SmsLog
+            
+            now = datetime.utcnow()
+            records = [
+                {
+                    'phone': phone,
+                    'event_id': event.id,
+                    'status': 'sent' if ok else 'failed',
+                    'created_at': now
+                }
+                for phone, ok in zip(phones, results)
+            ]
+            
+            for offset in range(0, len(records), 1000):
+                db.session.bulk_insert_mappings(SmsLog, records[offset:offset + 1000])
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to record SMS audit rows: {str(e)}")
+    
+    def send_bulk_sms(self, to_list, message):
+        """
+        Send one identical SMS message to many recipients
+        
+        Uses the Twilio Notify service when configured, which enqueues all
+        deliveries with a single API call instead of one call per
+        recipient. Only suitable for non-personalized bodies; callers that
+        interpolate per-recipient data (ticket numbers etc.) should send
+        individually.
+        
+        Args:
+            to_list (list): Recipient phone numbers (E.164 format)
+            message (str): SMS message content
+            
+        Returns:
+            dict: Send summary with 'total', 'successful' and 'failed' counts
+        """
+        total_count = len(to_list)
+        notify_sid = self.app.config.get('TWILIO_NOTIFY_SERVICE_SID') if self.app else None
+        
+        if self.client and notify_sid:
+            try:
+                self.client.notify.v1.services(notify_sid).notifications.create(
+                    to_binding=[
+                        json.dumps({'binding_type': 'sms', 'address': to})
+                        for to in to_list
+                    ],
+                    body=message
+                )
+                logger.info(f"Bulk SMS enqueued via Notify to {total_count} recipients")
+                return {'total': total_count, 'successful': total_count, 'failed': 0}
+            except Exception as e:
+                logger.error(f"Bulk SMS via Notify failed, falling back to per-recipient sends: {str(e)}")
+        
+        # No Notify service configured (or the batch call failed): send
+        # one message per recipient
+        success_count = sum(1 for to in to_list if self.send_sms(to, message))
+        return {
+            'total': total_count,
+            'successful': success_count,
+            'failed': total_count - success_count
+        }
+    
+    def send_event_reminder(self, guest, event, days_before=1):
+        """Send event reminder SMS to guest"""
+        message = (
+            f"REMINDER: {event.title} is in {days_before} day{'s' if days_before > 1 else ''}! "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
+            f"Venue: {event.venue}. "
+            f"Ticket: {guest.ticket_number}. "
+            f"We look forward to seeing you!"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def send_rsvp_confirmation(self, guest, event, status):
+        """Send RSVP confirmation SMS to guest"""
+        status_text = "confirmed" if status == "confirmed" else "declined"
+        message = (
+            f"RSVP {status_text.upper()} for {event.title}. "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}. "
+            f"Ticket: {guest.ticket_number}. "
+            f"{'See you there!' if status == 'confirmed' else 'Thank you for letting us know.'}"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def send_check_in_notification(self, guest, event):
+        """Send check-in confirmation SMS to guest"""
+        message = (
+            f"Checked in successfully! Welcome to {event.title}. "
+            f"Enjoy the event! "
+            f"Ticket: {guest.ticket_number}"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def send_event_update(self, guest, event, update_message):
+        """Send event update SMS to guest"""
+        message = (
+            f"UPDATE for {event.title}: {update_message} "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}. "
+            f"Ticket: {guest.ticket_number}"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def send_vendor_reminder(self, vendor, event, days_before=2):
+        """Send reminder SMS to vendor"""
+        message = (
+            f"REMINDER: Your {vendor.service_type} services for {event.title} "
+            f"are needed in {days_before} day{'s' if days_before > 1 else ''}. "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
+            f"Venue: {event.venue}. "
+            f"Contact organizer for questions."
+        )
+        
+        return self.send_sms(_best_phone(vendor), message)
+    
+    def send_payment_confirmation(self, user_phone, amount, event_title):
+        """Send payment confirmation SMS"""
+        message = (
+            f"PAYMENT CONFIRMED: ${amount:.2f} received for {event_title}. "
+            f"Thank you for your payment!"
+        )
+        
+        return self.send_sms(user_phone, message)
+    
+    def send_emergency_notification(self, guest, event, emergency_message):
+        """Send emergency notification SMS to guest"""
+        message = (
+            f"URGENT: {event.title} - {emergency_message} "
+            f"Please check your email for more information. "
+            f"Ticket: {guest.ticket_number}"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def send_welcome_message(self, guest, event):
+        """Send welcome SMS to newly registered guest"""
+        message = (
+            f"Welcome! You're registered for {event.title}. "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
+            f"Venue: {event.venue}. "
+            f"Ticket: {guest.ticket_number}. "
+            f"Check your email for details!"
+        )
+        
+        return self.send_sms(_best_phone(guest), message)
+    
+    def _bulk_send(self, messages):
+        """Send prepared (to, body) message pairs concurrently
+        
+        Prefers the asyncio path when httpx is installed and Twilio is
+        configured: one HTTP/2 connection multiplexes all in-flight
+        requests, so concurrency costs a coroutine rather than a thread
+        stack. Falls back to fanning send_sms out over a bounded thread
+        pool otherwise.
+        
+        Args:
+            messages (list): (phone_number, message) tuples to send
+            
+        Returns:
+            list: Per-message success flags, in input order
+        """
+        if not messages:
+            return []
+        
+        if HTTPX_AVAILABLE and self.client:
+            return self._bulk_send_async(messages)
+        
+        parallelism = self.app.config.get('SMS_PARALLELISM', 32) if self.app else 32
+        
+        with ThreadPoolExecutor(max_workers=min(parallelism, len(messages)),
+                                thread_name_prefix='sms') as pool:
+            futures = [pool.submit(self.send_sms, to, body) for to, body in messages]
+            return [future.result() for future in futures]
+    
+    def _bulk_send_async(self, messages):
+        """Send message pairs via asyncio against Twilio's REST endpoint
+        
+        Posts each message directly to the Messages resource through one
+        httpx.AsyncClient; a semaphore caps in-flight requests at
+        SMS_PARALLELISM for rate-limit headroom.
+        
+        Args:
+            messages (list): (phone_number, message) tuples to send
+            
+        Returns:
+            list: Per-message success flags, in input order
+        """
+        account_sid = self.app.config.get('TWILIO_ACCOUNT_SID')
+        auth = (account_sid, self.app.config.get('TWILIO_AUTH_TOKEN'))
+        from_number = self.app.config.get('TWILIO_PHONE_NUMBER')
+        url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+        parallelism = self.app.config.get('SMS_PARALLELISM', 32)
+        
+        async def send_one(client, sem, to, body):
+            async with sem:
+                try:
+                    response = await client.post(
+                        url, data={'To': to, 'From': from_number, 'Body': body}
+                    )
+                    if response.status_code < 400:
+                        return True
+                    logger.error(f"Failed to send SMS to {to}: HTTP {response.status_code}")
+                    return False
+                except Exception as e:
+                    logger.error(f"Failed to send SMS to {to}: {str(e)}")
+                    return False
+        
+        async def run():
+            sem = asyncio.Semaphore(parallelism)
+            async with httpx.AsyncClient(http2=True, auth=auth, timeout=10) as client:
+                return await asyncio.gather(
+                    *(send_one(client, sem, to, body) for to, body in messages)
+                )
+        
+        return asyncio.run(run())
+    
+    def bulk_send_event_reminders(self, guests, event, days_before=1):
+        """Send bulk event reminders to all guests"""
+        # Only send to guests with phone numbers
+        recipients = [guest for guest in guests if guest.phone]
+        total_count = len(recipients)
+        
+        # Everything except the ticket number is identical across guests,
+        # so format the shared portion of the message once per bulk call,
+        # pluralization included
+        day_word = 'day' if days_before == 1 else 'days'
+        message_prefix = (
+            f"REMINDER: {event.title} is in {days_before} {day_word}! "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
+            f"Venue: {event.venue}. "
+        )
+        
+        # When ticket personalization is switched off the body is the same
+        # for every guest, and the whole batch can go out as one Notify
+        # call instead of one API request per recipient
+        if self.app and self.app.config.get('SMS_GENERIC_BULK', False):
+            phones = [_best_phone(guest) for guest in recipients]
+            result = self.send_bulk_sms(phones, f"{message_prefix}We look forward to seeing you!")
+            self._log_sends(event, phones, [result['failed'] == 0] * len(phones))
+            logger.info(
+                f"Bulk SMS reminders sent: {result['successful']}/{result['total']} successful"
+            )
+            return result
+        
+        messages = [
+            (_best_phone(guest),
+             f"{message_prefix}Ticket: {guest.ticket_number}. We look forward to seeing you!")
+            for guest in recipients
+        ]
+        results = self._bulk_send(messages)
+        success_count = sum(results)
+        self._log_sends(event, [to for to, _body in messages], results)
+        
+        logger.info(f"Bulk SMS reminders sent: {success_count}/{total_count} successful")
+        return {
+            'total': total_count,
+            'successful': success_count,
+            'failed': total_count - success_count
+        }
+    
+    def bulk_send_vendor_reminders(self, vendors, event, days_before=2):
+        """Send bulk reminders to all vendors"""
+        # Only send to vendors with phone numbers
+        recipients = [vendor for vendor in vendors if vendor.phone]
+        total_count = len(recipients)
+        
+        # Only the service type varies per vendor; format the shared
+        # remainder of the message once per bulk call, pluralization
+        # included
+        day_word = 'day' if days_before == 1 else 'days'
+        message_suffix = (
+            f" services for {event.title} "
+            f"are needed in {days_before} {day_word}. "
+            f"Date: {event.start_date.strftime('%b %d, %I:%M %p')}, "
+            f"Venue: {event.venue}. "
+            f"Contact organizer for questions."
+        )
+        
+        messages = [
+            (_best_phone(vendor), f"REMINDER: Your {vendor.service_type}{message_suffix}")
+            for vendor in recipients
+        ]
+        results = self._bulk_send(messages)
+        success_count = sum(results)
+        self._log_sends(event, [to for to, _body in messages], results)
+        
+        logger.info(f"Bulk vendor reminders sent: {success_count}/{total_count} successful")
+        return {
+            'total': total_count,
+            'successful': success_count,
+            'failed': total_count - success_count
+        }
+    
+    def get_sms_status(self, message_sid):
+        """Get status of a sent SMS message"""
+        try:
+            if not self.client:
+                return {'status': 'simulated', 'error': 'Twilio not configured'}
+            
+            message = self.client.messages(message_sid).fetch()
+            return {
+                'status': message.status,
+                'date_created': message.date_created,
+                'date_sent': message.date_sent,
+                'error_code': message.error_code,
+                'error_message': message.error_message
+            }
+        except Exception as e:
+            logger.error(f"Failed to get SMS status for {message_sid}: {str(e)}")
+            return {'status': 'error', 'error': str(e)}
+    
+    def validate_phone_number(self, phone_number):
+        """Validate and format phone number"""
+        try:
+            if not self.client:
+                # Basic validation for simulation
+                phone_number = phone_number.strip()
+                if phone_number.startswith('+'):
+                    return phone_number
+                elif phone_number.startswith('0'):
+                    return f'+265{phone_number[1:]}'  # Malawi country code
+                else:
+                    return f'+265{phone_number}'
+            
+            # Use Twilio lookup for proper validation
+            phone_number = self.client.lookups.v2.phone_numbers(phone_number).fetch()
+            return phone_number.phone_number
+        except Exception as e:
+            logger.error(f"Phone number validation failed for {phone_number}: {str(e)}")
+            return None
+
+# Global SMS service instance
 sms_service = SMSService()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Task Queue Module
+
+This module provides an in-process background task queue:
+- Scheduler jobs enqueue work and return immediately
+- Daemon worker threads drain the queue under an app context
+"""
+
+import queue
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TaskQueue:
+    """Background task queue backed by daemon worker threads"""
+    
+    def __init__(self, app=None):
+        """Initialize the task queue"""
+        self.app = app
+        self._queue = None
+        self._workers = []
+        if app:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Initialize with Flask app"""
+        self.app = app
+        
+        # Bounded queue: a full queue rejects new work instead of letting
+        # a runaway producer grow memory without limit
+        self._queue = queue.Queue(maxsize=app.config.get('TASK_QUEUE_MAXSIZE', 1000))
+        
+        for index in range(app.config.get('TASK_QUEUE_WORKERS', 4)):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f'task-worker-{index}',
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        
+        logger.info(f"Task queue started with {len(self._workers)} workers")
+    
+    def enqueue(self, func, *args, **kwargs):
+        """
+        Queue a callable to run on a background worker
+        
+        Args:
+            func: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+            
+        Returns:
+            bool: True if queued, False if the queue is full
+        """
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+            return True
+        except queue.Full:
+            logger.error(f"Task queue full; dropping task {getattr(func, '__name__', repr(func))}")
+            return False
+    
+    def pending_count(self):
+        """Get the approximate number of queued tasks"""
+        return self._queue.qsize() if self._queue else 0
+    
+    def _worker_loop(self):
+        """Drain the queue forever, one task at a time"""
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                with self.app.app_context():
+                    from app import db
+                    try:
+                        func(*args, **kwargs)
+                    finally:
+                        # Worker threads are long-lived; without this the
+                        # session from one task would leak into the next
+                        db.session.remove()
+            except Exception as e:
+                logger.error(f"Background task {getattr(func, '__name__', repr(func))} failed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+# Global task queue instance
+task_queue = TaskQueue()